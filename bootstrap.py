@@ -0,0 +1,16 @@
+"""Create or update the database schema.
+
+Run once per deployment before starting the app. App processes don't check
+the schema themselves unless started with RUN_MIGRATIONS=1.
+
+This is also the only place an audit_logs table created before partitioning
+is converted. Its existing rows become a single audit_logs_legacy partition,
+which can only be dropped as a whole, not month by month.
+"""
+from models.database import db
+
+if __name__ == "__main__":
+    try:
+        db.create_tables(convert_legacy_audit_logs=True)
+    finally:
+        db.close()
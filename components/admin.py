@@ -1,22 +1,113 @@
 import streamlit as st
 import os
+import time
 import pandas as pd
 import altair as alt
 from datetime import datetime, timedelta
+from itertools import islice
 from models.entities import EntityManager
+from components.pagination import paginate
 from utils.auth import (
     check_password, logout, hash_password, is_super_admin,
     get_current_username, get_all_admins, create_admin,
     update_admin_password, delete_admin
 )
-from utils.audit import log_admin_action, get_audit_logs, get_audit_summary
+from utils.audit import log_admin_action, AUDIT_LOG_LIMIT
+from utils.cache import (
+    get_cached_entities, get_cached_relationships_for_entities,
+    get_cached_tags, get_cached_tags_for_entities, get_cached_audit_logs,
+    get_cached_recent_audit_logs, get_cached_audit_summary, clear_cached_reads
+)
+
+# Action types beyond this many are grouped into a single "Other" bar
+MAX_CHART_ACTIONS = 15
+
+ENTITY_TYPES = ("Capability", "Use Case", "Tool", "Product")
+ENTITY_TYPE_FILTERS = ("All",) + ENTITY_TYPES
+REL_TYPES = ("enables", "implemented by", "uses", "supports", "powered by", "delivers")
+REL_TYPE_INDEX = {rel_type: i for i, rel_type in enumerate(REL_TYPES)}
+
+# Upper bound on the ids kept in any per-session selection set
+MAX_SELECTED_IDS = 10_000
+
+def bounded_selection(ids):
+    """Return the ids as a set holding at most MAX_SELECTED_IDS entries."""
+    return set(islice(ids, MAX_SELECTED_IDS))
+
+def render_selection_grid(rows, column_config, key, select_all=False, select_label="Select"):
+    """Render rows as a read-only grid with a checkbox column and return the ticked ids.
+    
+    The grid's input holds only the rows, with every box ticked when
+    select_all is set, so it stays the same from one click to the next and
+    the editor keeps its edits. The selection is read only from what the
+    editor returns.
+    
+    Args:
+        rows: Dicts with an 'id' and a value for every column_config key
+        column_config: Column name -> heading for the columns to show
+        key: Widget key, unique per grid on the page
+        select_all: Whether every box starts out ticked
+        select_label: Heading of the checkbox column
+    """
+    columns = list(column_config)
+    table = pd.DataFrame(rows, columns=['id'] + columns)
+    table.insert(0, 'select', select_all)
+    edited = st.data_editor(
+        table,
+        hide_index=True,
+        use_container_width=True,
+        disabled=['id'] + columns,
+        column_config={
+            'select': st.column_config.CheckboxColumn(select_label),
+            'id': None,
+            **column_config
+        },
+        # A separate key per select-all state so toggling it starts the grid afresh
+        key=f"{key}_all" if select_all else key
+    )
+    return bounded_selection(edited.loc[edited['select'], 'id'].tolist())
+
+def render_paged_selection_grid(rows, column_config, key, select_all=False, select_label="Select"):
+    """Render one page of rows as a selection grid and return the selected ids.
+    
+    Ticks only cover the page shown and are cleared by changing page. With
+    select_all set, the rows on the other pages count as selected too.
+    """
+    page_rows = paginate(rows, key=key)
+    page = st.session_state.get(f"{key}_page", 1)
+    selected = render_selection_grid(
+        page_rows, column_config, f"{key}_editor_{page}", select_all, select_label
+    )
+    if select_all:
+        page_ids = {row['id'] for row in page_rows}
+        selected = bounded_selection(
+            list(selected) + [row['id'] for row in rows if row['id'] not in page_ids]
+        )
+    return selected
+
+# Minimum gap between two applied changes, so a double-click on a mutation
+# button is not applied (and rerun) twice
+MUTATION_DEBOUNCE_SECONDS = 0.5
+
+def accept_mutation():
+    """Return True and record the time unless a change was applied within the debounce window."""
+    now = time.time()
+    if now - st.session_state.get('last_action_ts', 0) < MUTATION_DEBOUNCE_SECONDS:
+        return False
+    st.session_state.last_action_ts = now
+    return True
 
+@st.fragment(run_every=30)
 def render_admin_dashboard():
-    """Render the admin activity dashboard with metrics and visualizations."""
+    """Render the admin activity dashboard with metrics and visualizations.
+    
+    Runs as a fragment that refreshes itself every 30 seconds without
+    rerunning the other admin tabs.
+    """
     st.header("Admin Activity Dashboard")
     
     # Get audit summary for metrics
-    summary = get_audit_summary()
+    summary = get_cached_audit_summary()
     
     # Display key metrics in columns
     col1, col2, col3 = st.columns(3)
@@ -52,14 +143,23 @@ def render_admin_dashboard():
     st.subheader("Action Distribution")
     if summary.get('action_counts'):
         # Create DataFrame and format action types
-        action_data = pd.DataFrame(
-            list(summary['action_counts'].items()),
-            columns=['Action Type', 'Count']
-        )
+        action_counts = summary['action_counts']
+        action_data = pd.DataFrame({
+            'Action Type': list(action_counts.keys()),
+            'Count': list(action_counts.values())
+        })
         # Format action types to be more readable
-        action_data['Action Type'] = action_data['Action Type'].apply(
-            lambda x: x.replace('_', ' ').title()
+        action_data['Action Type'] = (
+            action_data['Action Type'].str.replace('_', ' ', regex=False).str.title()
         )
+        # Keep the chart bounded by rolling the least frequent action types into "Other"
+        if len(action_data) > MAX_CHART_ACTIONS:
+            top_actions = action_data.nlargest(MAX_CHART_ACTIONS, 'Count')
+            other = pd.DataFrame([{
+                'Action Type': 'Other',
+                'Count': action_data['Count'].sum() - top_actions['Count'].sum()
+            }])
+            action_data = pd.concat([top_actions, other], ignore_index=True)
         # Sort by count in descending order
         action_data = action_data.sort_values('Count', ascending=True)
         
@@ -81,10 +181,10 @@ def render_admin_dashboard():
     
     # Display recent activity
     st.subheader("Recent Activity")
-    recent_logs = get_audit_logs({"date_from": datetime.now() - timedelta(days=1)})
+    recent_logs = get_cached_recent_audit_logs(limit=5)
     
     if recent_logs:
-        for log in recent_logs[:5]:  # Show last 5 activities
+        for log in recent_logs:  # Show last 5 activities
             with st.expander(
                 f"{log['action_type']} by {log['admin_username']} "
                 f"({log['created_at'].strftime('%H:%M:%S')})"
@@ -103,11 +203,10 @@ def render_relationship_manager():
     st.header("Manage Relationships")
     
     # Add entity type filter for relationships
-    entity_types = ["All", "Capability", "Use Case", "Tool", "Product"]
-    selected_type = st.selectbox("Filter by Entity Type", entity_types, key="rel_type_filter")
+    selected_type = st.selectbox("Filter by Entity Type", ENTITY_TYPE_FILTERS, key="rel_type_filter")
     
     # Get filtered entities based on type
-    entities = EntityManager.get_entities(
+    entities = get_cached_entities(
         entity_type=selected_type if selected_type != "All" else None
     )
     
@@ -133,10 +232,10 @@ def render_relationship_manager():
     
     relationship_type = st.selectbox(
         "Relationship Type",
-        options=["enables", "implemented by", "uses", "supports", "powered by", "delivers"]
+        options=REL_TYPES
     )
     
-    if st.button("Create Relationship"):
+    if st.button("Create Relationship") and accept_mutation():
         try:
             EntityManager.create_relationship(
                 source_entity['id'],
@@ -144,140 +243,132 @@ def render_relationship_manager():
                 relationship_type
             )
             st.success("Relationship created successfully!")
+            clear_cached_reads()
             st.rerun()
         except Exception as e:
             st.error(f"Error creating relationship: {str(e)}")
     
     # View and manage existing relationships
     st.subheader("Existing Relationships")
-    filtered_entities = [e for e in entities if selected_type == "All" or e['type'] == selected_type]
     
-    # Initialize session state for relationship selection if not exists
-    if 'selected_relationships' not in st.session_state:
-        st.session_state.selected_relationships = set()
+    # Only render the current page of entities
+    page_entities = paginate(entities, key="rel_manager")
     
-    # Track all visible relationships for select all functionality
-    all_visible_relationship_ids = set()
+    # Fetch relationships for every entity on the page in one query
+    relationships_by_entity = get_cached_relationships_for_entities(
+        [entity['id'] for entity in page_entities]
+    )
     
-    for entity in filtered_entities:
+    for entity in page_entities:
         with st.expander(f"Relationships for {entity['name']} ({entity['type']})"):
-            relationships = EntityManager.get_entity_relationships(entity['id'])
+            relationships = relationships_by_entity.get(entity['id'], [])
             if relationships:
-                # Add relationship IDs to visible set
-                for rel in relationships:
-                    all_visible_relationship_ids.add(rel['id'])
-                
                 # Add select all checkbox for this entity's relationships
                 entity_select_all = st.checkbox(
                     "Select All Relationships",
                     key=f"select_all_rel_{entity['id']}"
                 )
-                if entity_select_all:
-                    st.session_state.selected_relationships.update(
-                        rel['id'] for rel in relationships
-                    )
-                elif not entity_select_all and all(
-                    rel['id'] in st.session_state.selected_relationships 
-                    for rel in relationships
-                ):
-                    for rel in relationships:
-                        st.session_state.selected_relationships.discard(rel['id'])
+                
+                # One grid with a select column replaces a checkbox row per relationship
+                selected_ids = render_selection_grid(
+                    relationships,
+                    {'related_entity_name': "With", 'relationship_type': "Type"},
+                    key=f"rel_editor_{entity['id']}",
+                    select_all=entity_select_all
+                )
                 
                 # Add delete selected button if any relationships are selected
-                if st.session_state.selected_relationships:
+                if selected_ids:
                     if st.button(
-                        f"Delete Selected Relationships ({len(st.session_state.selected_relationships)})",
+                        f"Delete Selected Relationships ({len(selected_ids)})",
                         key=f"del_selected_rel_{entity['id']}"
-                    ):
+                    ) and accept_mutation():
                         try:
-                            EntityManager.delete_multiple_relationships(
-                                list(st.session_state.selected_relationships)
-                            )
-                            st.success(f"Successfully deleted {len(st.session_state.selected_relationships)} relationships")
-                            st.session_state.selected_relationships.clear()
+                            EntityManager.delete_multiple_relationships(list(selected_ids))
+                            st.success(f"Successfully deleted {len(selected_ids)} relationships")
+                            clear_cached_reads()
                             st.rerun()
                         except Exception as e:
                             st.error(f"Error deleting relationships: {str(e)}")
                 
-                for idx, rel in enumerate(relationships):
-                    checkbox_col, col1, col2, col3, col4 = st.columns([0.5, 2, 2, 2, 1])
-                    
-                    with checkbox_col:
-                        relationship_selected = st.checkbox(
-                            "",
-                            value=rel['id'] in st.session_state.selected_relationships,
-                            key=f"rel_select_{entity['id']}_{rel['id']}"
-                        )
-                        if relationship_selected:
-                            st.session_state.selected_relationships.add(rel['id'])
-                        else:
-                            st.session_state.selected_relationships.discard(rel['id'])
-                    
-                    with col1:
-                        # Add dropdown to select new target entity
-                        other_entities = [e for e in entities if e['id'] != entity['id']]
-                        current_related = next((e for e in entities if e['name'] == rel['related_entity_name']), None)
-                        
-                        new_target = st.selectbox(
-                            "With",
-                            options=other_entities,
-                            format_func=lambda x: f"{x['name']} ({x['type']})",
-                            index=other_entities.index(current_related) if current_related else 0,
-                            key=f"target_{entity['id']}_{rel['id']}_{idx}"
-                        )
-                    
-                    with col2:
-                        new_rel_type = st.selectbox(
-                            "Type",
-                            options=["enables", "implemented by", "uses", "supports", "powered by", "delivers"],
-                            key=f"rel_type_{entity['id']}_{rel['id']}_{idx}",
-                            index=["enables", "implemented by", "uses", "supports", "powered by", "delivers"].index(rel['relationship_type'])
-                        )
-                    
-                    with col3:
-                        # Update button for both relationship type and target
-                        if (new_rel_type != rel['relationship_type'] or 
-                            new_target['name'] != rel['related_entity_name']):
-                            if st.button("Update", key=f"update_rel_{entity['id']}_{rel['id']}_{idx}"):
-                                try:
-                                    if new_target['name'] != rel['related_entity_name']:
-                                        # Delete old relationship and create new one
-                                        EntityManager.delete_relationship(entity['id'], rel['related_entity_name'])
-                                        EntityManager.create_relationship(
-                                            entity['id'],
-                                            new_target['id'],
-                                            new_rel_type
-                                        )
-                                    else:
-                                        # Just update the relationship type
-                                        EntityManager.update_relationship(rel['id'], new_rel_type)
-                                    st.success("Relationship updated successfully!")
-                                    st.rerun()
-                                except Exception as e:
-                                    st.error(f"Error updating relationship: {str(e)}")
-                    
-                    with col4:
-                        if st.button(
-                            "Delete",
-                            key=f"del_rel_{entity['id']}_{rel['id']}_{idx}"
-                        ):
-                            EntityManager.delete_relationship(entity['id'], rel['related_entity_name'])
-                            st.success("Relationship deleted successfully!")
-                            st.rerun()
-                    st.divider()
+                # Edit controls are only shown when exactly one relationship is selected
+                selected_rels = [rel for rel in relationships if rel['id'] in selected_ids]
+                if len(selected_rels) == 1:
+                    render_relationship_editor(entity, selected_rels[0], entities)
             else:
                 st.info("No relationships found for this entity.")
 
+@st.fragment
+def render_relationship_editor(entity, rel, entities):
+    """Render the target, type, update and delete controls for one relationship.
+    
+    Runs as a fragment so changing the selections only reruns this row.
+    """
+    col1, col2, col3, col4 = st.columns([2, 2, 2, 1])
+    
+    with col1:
+        # Add dropdown to select new target entity
+        other_entities = [e for e in entities if e['id'] != entity['id']]
+        other_index = {e['id']: i for i, e in enumerate(other_entities)}
+        
+        new_target = st.selectbox(
+            "With",
+            options=other_entities,
+            format_func=lambda x: f"{x['name']} ({x['type']})",
+            index=other_index.get(rel['related_entity_id'], 0),
+            key=f"target_{entity['id']}_{rel['id']}"
+        )
+    
+    with col2:
+        new_rel_type = st.selectbox(
+            "Type",
+            options=REL_TYPES,
+            key=f"rel_type_{entity['id']}_{rel['id']}",
+            index=REL_TYPE_INDEX.get(rel['relationship_type'], 0)
+        )
+    
+    with col3:
+        # Update button for both relationship type and target
+        if (new_rel_type != rel['relationship_type'] or 
+            new_target['name'] != rel['related_entity_name']):
+            if st.button("Update", key=f"update_rel_{entity['id']}_{rel['id']}") and accept_mutation():
+                try:
+                    if new_target['name'] != rel['related_entity_name']:
+                        # Delete old relationship and create new one
+                        EntityManager.delete_relationship(entity['id'], rel['related_entity_name'])
+                        EntityManager.create_relationship(
+                            entity['id'],
+                            new_target['id'],
+                            new_rel_type
+                        )
+                    else:
+                        # Just update the relationship type
+                        EntityManager.update_relationship(rel['id'], new_rel_type)
+                    st.success("Relationship updated successfully!")
+                    clear_cached_reads()
+                    st.rerun()
+                except Exception as e:
+                    st.error(f"Error updating relationship: {str(e)}")
+    
+    with col4:
+        if st.button(
+            "Delete",
+            key=f"del_rel_{entity['id']}_{rel['id']}"
+        ) and accept_mutation():
+            EntityManager.delete_relationship(entity['id'], rel['related_entity_name'])
+            st.success("Relationship deleted successfully!")
+            clear_cached_reads()
+            st.rerun()
+
 def render_entity_list():
     """Render the entity list management interface."""
     st.header("Manage Existing Entities")
     
     # Add entity type filter
-    entity_types = ["All", "Capability", "Use Case", "Tool", "Product"]
-    selected_type = st.selectbox("Filter by Entity Type", entity_types, key="entity_type_filter")
+    selected_type = st.selectbox("Filter by Entity Type", ENTITY_TYPE_FILTERS, key="entity_type_filter")
     
     # Get filtered entities
-    entities = EntityManager.get_entities(
+    entities = get_cached_entities(
         entity_type=selected_type if selected_type != "All" else None
     )
     
@@ -285,88 +376,97 @@ def render_entity_list():
         st.info("No entities found.")
         return
 
-    # Initialize session state for entity selection if not exists
-    if 'selected_entities' not in st.session_state:
-        st.session_state.selected_entities = set()
-
     # Add select all checkbox
     select_all = st.checkbox("Select All Entities", key="select_all_entities")
-    if select_all:
-        st.session_state.selected_entities = {entity['id'] for entity in entities}
-    elif not select_all and len(st.session_state.selected_entities) == len(entities):
-        st.session_state.selected_entities.clear()
+
+    # One grid with a select column replaces a checkbox and expander per
+    # entity; only the current page of entities is rendered
+    selected_ids = render_paged_selection_grid(
+        entities,
+        {'type': "Type", 'name': "Name", 'description': "Description"},
+        key="entity_list",
+        select_all=select_all
+    )
 
     # Add delete selected button
-    if st.session_state.selected_entities:
-        if st.button(f"Delete Selected Entities ({len(st.session_state.selected_entities)})"):
+    if selected_ids:
+        if (st.button(f"Delete Selected Entities ({len(selected_ids)})")
+                and accept_mutation()):
             try:
-                EntityManager.delete_multiple_entities(list(st.session_state.selected_entities))
-                st.success(f"Successfully deleted {len(st.session_state.selected_entities)} entities")
-                st.session_state.selected_entities.clear()
+                EntityManager.delete_multiple_entities(list(selected_ids))
+                st.success(f"Successfully deleted {len(selected_ids)} entities")
+                clear_cached_reads()
                 st.rerun()
             except Exception as e:
                 st.error(f"Error deleting entities: {str(e)}")
-        
-    # Display entities in expandable sections
-    for entity in entities:
-        col1, col2 = st.columns([0.5, 11.5])
-        with col1:
-            entity_selected = st.checkbox("", value=entity['id'] in st.session_state.selected_entities,
-                                       key=f"entity_select_{entity['id']}")
-            if entity_selected:
-                st.session_state.selected_entities.add(entity['id'])
-            else:
-                st.session_state.selected_entities.discard(entity['id'])
-        
-        with col2:
-            with st.expander(f"{entity['name']} ({entity['type']})"):
-                description = st.text_area("Description", entity['description'], key=f"desc_{entity['id']}")
+    
+    # Edit controls are only shown when exactly one entity is selected
+    if len(selected_ids) == 1:
+        entity_id = next(iter(selected_ids))
+        entity = next((e for e in entities if e['id'] == entity_id), None)
+        if entity:
+            render_entity_editor(entity)
+
+@st.fragment
+def render_entity_editor(entity):
+    """Render the edit and delete controls for a single entity.
+    
+    Runs as a fragment so editing the fields only reruns this panel.
+    """
+    st.subheader(f"{entity['name']} ({entity['type']})")
+    description = st.text_area("Description", entity['description'], key=f"desc_{entity['id']}")
+    
+    # Get and display current tags
+    current_tags = get_cached_tags_for_entities([entity['id']]).get(entity['id'], [])
+    current_tag_names = [tag['name'] for tag in current_tags]
+    
+    # Get all available tags
+    all_tags = get_cached_tags()
+    selected_tags = st.multiselect(
+        "Tags",
+        options=all_tags,
+        default=current_tag_names,
+        key=f"tags_{entity['id']}"
+    )
+    
+    col1, col2, _ = st.columns([1, 1, 6])
+    
+    # Update entity if changes are made
+    with col1:
+        if st.button("Update", key=f"update_{entity['id']}") and accept_mutation():
+            try:
+                # Update description if changed
+                if description != entity['description']:
+                    EntityManager.update_entity(entity['id'], description=description)
                 
-                # Get and display current tags
-                current_tags = EntityManager.get_entity_tags(entity['id'])
-                current_tag_names = [tag['name'] for tag in current_tags]
+                # Update tags if changed
+                if set(selected_tags) != set(current_tag_names):
+                    EntityManager.update_entity_tags(entity['id'], selected_tags)
                 
-                # Get all available tags
-                all_tags = EntityManager.get_tags()
-                selected_tags = st.multiselect(
-                    "Tags",
-                    options=all_tags,
-                    default=current_tag_names,
-                    key=f"tags_{entity['id']}"
+                st.success("Entity updated successfully!")
+                clear_cached_reads()
+                st.rerun()
+            except Exception as e:
+                st.error(f"Error updating entity: {str(e)}")
+    
+    # Delete entity
+    with col2:
+        if st.button("Delete", key=f"delete_{entity['id']}") and accept_mutation():
+            try:
+                # Log before deletion
+                log_admin_action(
+                    action_type="delete_entity",
+                    entity_type=entity['type'],
+                    entity_id=entity['id'],
+                    details={"name": entity['name']}
                 )
                 
-                # Update entity if changes are made
-                if st.button("Update", key=f"update_{entity['id']}"):
-                    try:
-                        # Update description if changed
-                        if description != entity['description']:
-                            EntityManager.update_entity(entity['id'], description=description)
-                        
-                        # Update tags if changed
-                        if set(selected_tags) != set(current_tag_names):
-                            EntityManager.update_entity_tags(entity['id'], selected_tags)
-                        
-                        st.success("Entity updated successfully!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"Error updating entity: {str(e)}")
-                
-                # Delete entity
-                if st.button("Delete", key=f"delete_{entity['id']}"):
-                    try:
-                        # Log before deletion
-                        log_admin_action(
-                            action_type="delete_entity",
-                            entity_type=entity['type'],
-                            entity_id=entity['id'],
-                            details={"name": entity['name']}
-                        )
-                        
-                        EntityManager.delete_entity(entity['id'])
-                        st.success("Entity deleted successfully!")
-                        st.rerun()
-                    except Exception as e:
-                        st.error(f"Error deleting entity: {str(e)}")
+                EntityManager.delete_entity(entity['id'])
+                st.success("Entity deleted successfully!")
+                clear_cached_reads()
+                st.rerun()
+            except Exception as e:
+                st.error(f"Error deleting entity: {str(e)}")
 
 def render_admin_management():
     """Render admin management interface for super admins."""
@@ -517,12 +617,12 @@ def render_admin_interface():
     with tabs[tab_index]:
         st.header("Create New Entity")
         
-        entity_type = st.selectbox("Entity Type", ["Capability", "Use Case", "Tool", "Product"])
+        entity_type = st.selectbox("Entity Type", ENTITY_TYPES)
         name = st.text_input("Name")
         description = st.text_area("Description")
         
         # Tag Management Section
-        all_tags = EntityManager.get_tags()
+        all_tags = get_cached_tags()
         selected_tags = st.multiselect("Select Tags", all_tags)
         
         # Add new tag input
@@ -532,20 +632,17 @@ def render_admin_interface():
                 if new_tag not in all_tags:
                     EntityManager.add_tag(None, new_tag)
                     st.success(f"Tag '{new_tag}' added successfully!")
+                    clear_cached_reads()
                     st.rerun()
                 else:
                     st.warning(f"Tag '{new_tag}' already exists!")
         
-        if st.button("Create Entity"):
+        if st.button("Create Entity") and accept_mutation():
             if not name:
                 st.error("Name is required!")
             else:
                 try:
-                    entity_id = EntityManager.create_entity(name, entity_type, description)
-                    
-                    # Add selected tags to the entity
-                    for tag in selected_tags:
-                        EntityManager.add_tag(entity_id, tag)
+                    entity_id = EntityManager.create_entity(name, entity_type, description, tags=selected_tags)
                     
                     # Log the entity creation
                     log_admin_action(
@@ -559,6 +656,7 @@ def render_admin_interface():
                     )
                     
                     st.success("Entity created successfully!")
+                    clear_cached_reads()
                     st.rerun()
                 except Exception as e:
                     st.error(f"Error creating entity: {str(e)}")
@@ -590,10 +688,9 @@ def render_bulk_delete():
     st.warning("⚠️ This is a powerful tool that allows bulk deletion of entities. Please use with caution.")
     
     # Entity type filter
-    entity_types = ["All", "Capability", "Use Case", "Tool", "Product"]
     selected_type = st.selectbox(
         "Filter by Entity Type",
-        entity_types,
+        ENTITY_TYPE_FILTERS,
         key="bulk_delete_type_filter"
     )
     
@@ -605,7 +702,7 @@ def render_bulk_delete():
         date_to = st.date_input("Created To", key="bulk_delete_date_to")
     
     # Get filtered entities for preview
-    entities = EntityManager.get_entities(
+    entities = get_cached_entities(
         entity_type=selected_type if selected_type != "All" else None,
         date_filter=date_from if date_from else None,
         date_to=date_to if date_to else None
@@ -618,62 +715,49 @@ def render_bulk_delete():
     # Preview section
     st.subheader(f"Preview ({len(entities)} entities)")
     
-    # Initialize session state for entity selection
-    if 'bulk_delete_selected' not in st.session_state:
-        st.session_state.bulk_delete_selected = set()
-    
     # Select all checkbox
     select_all = st.checkbox("Select All for Deletion", key="bulk_delete_select_all")
-    if select_all:
-        st.session_state.bulk_delete_selected = {entity['id'] for entity in entities}
-    elif not select_all and len(st.session_state.bulk_delete_selected) == len(entities):
-        st.session_state.bulk_delete_selected.clear()
-    
-    # Display entities in a scrollable container
-    with st.container():
-        for entity in entities:
-            col1, col2, col3 = st.columns([0.5, 2, 8])
-            with col1:
-                entity_selected = st.checkbox(
-                    "",
-                    value=entity['id'] in st.session_state.bulk_delete_selected,
-                    key=f"bulk_delete_{entity['id']}"
-                )
-                if entity_selected:
-                    st.session_state.bulk_delete_selected.add(entity['id'])
-                else:
-                    st.session_state.bulk_delete_selected.discard(entity['id'])
-            
-            with col2:
-                st.write(entity['type'])
-            with col3:
-                st.write(f"{entity['name']} - {entity['description'][:100]}...")
+    
+    # One grid with a select column replaces a checkbox row per entity;
+    # only the current page of entities is rendered
+    selected_ids = render_paged_selection_grid(
+        entities,
+        {'type': "Type", 'name': "Name", 'description': "Description"},
+        key="bulk_delete",
+        select_all=select_all,
+        select_label="Delete"
+    )
     
     # Delete button with confirmation
-    if st.session_state.bulk_delete_selected:
+    if selected_ids:
         st.markdown("---")
-        st.warning(f"🗑️ {len(st.session_state.bulk_delete_selected)} entities selected for deletion")
+        st.warning(f"🗑️ {len(selected_ids)} entities selected for deletion")
         
-        if st.button("Confirm Bulk Delete", type="primary"):
+        if st.button("Confirm Bulk Delete", type="primary") and accept_mutation():
             try:
                 # Log the bulk delete action before deletion
                 log_admin_action(
                     action_type="bulk_delete",
                     details={
-                        "count": len(st.session_state.bulk_delete_selected),
+                        "count": len(selected_ids),
+                        "ids": sorted(selected_ids),
                         "entity_type": selected_type,
                         "date_range": f"{date_from} to {date_to}" if date_from and date_to else "All dates"
                     }
                 )
                 
                 # Perform deletion
-                EntityManager.delete_multiple_entities(list(st.session_state.bulk_delete_selected))
-                st.success(f"Successfully deleted {len(st.session_state.bulk_delete_selected)} entities")
-                st.session_state.bulk_delete_selected.clear()
+                EntityManager.delete_multiple_entities(list(selected_ids))
+                st.success(f"Successfully deleted {len(selected_ids)} entities")
+                clear_cached_reads()
                 st.rerun()
             except Exception as e:
                 st.error(f"Error during bulk deletion: {str(e)}")
 
+def set_audit_logs_window(before):
+    """Show the audit entries older than before, a (created_at, id) pair, or the newest when None."""
+    st.session_state["audit_logs_before"] = before
+
 def render_audit_logs():
     """Render the audit logs viewer interface."""
     st.header("Audit Logs")
@@ -701,24 +785,30 @@ def render_audit_logs():
         filters['date_from'] = date_from
     if date_to:
         filters['date_to'] = date_to
+    # Older entries are fetched a window at a time, continuing after the
+    # last entry of the previous window
+    if st.session_state.get("audit_logs_before"):
+        filters['before'] = st.session_state.audit_logs_before
     
     # Get and display audit logs
-    logs = get_audit_logs(filters)
+    logs = get_cached_audit_logs(filters)
     
     if not logs:
         st.info("No audit logs found matching the filters.")
+        if filters.get('before'):
+            st.button("Back to newest entries", on_click=set_audit_logs_window, args=(None,))
         return
     
     # Display summary metrics
-    summary = get_audit_summary()
+    summary = get_cached_audit_summary()
     
     # Show summary metrics in a clean layout with better formatting
     metrics_cols = st.columns(3)
     with metrics_cols[0]:
         st.metric(
             "Total Actions", 
-            len(logs),
-            help="Total number of audit log entries matching current filters"
+            f"{len(logs)}+" if len(logs) >= AUDIT_LOG_LIMIT else len(logs),
+            help="Number of audit log entries matching current filters"
         )
     with metrics_cols[1]:
         st.metric(
@@ -728,19 +818,18 @@ def render_audit_logs():
         )
     with metrics_cols[2]:
         # Most common action with improved formatting
-        action_counts = summary.get('action_counts', {})
-        if action_counts:
-            most_common = max(action_counts.items(), key=lambda x: x[1])
-            action_name = most_common[0].replace('_', ' ').title()
+        most_common_action = summary.get('most_common_action')
+        if most_common_action:
+            action_name = most_common_action.replace('_', ' ').title()
             st.metric(
                 "Most Common Action", 
                 action_name,
-                f"Count: {most_common[1]}",
+                f"Count: {summary['most_common_count']}",
                 help="Most frequently performed action with its count"
             )
     
-    # Display logs in an expandable table
-    for log in logs:
+    # Display one page of logs in an expandable table
+    for log in paginate(logs, key="audit_logs"):
         with st.expander(f"{log['action_type']} by {log['admin_username']} ({log['admin_role']})"):
             st.write(f"**Time:** {log['created_at']}")
             if log['entity_type']:
@@ -749,4 +838,17 @@ def render_audit_logs():
                 st.write(f"**Entity ID:** {log['entity_id']}")
             if log['details']:
                 st.write("**Details:**")
-                st.json(log['details'])
\ No newline at end of file
+                st.json(log['details'])
+    
+    # Only the newest AUDIT_LOG_LIMIT matching entries are loaded at once
+    nav_cols = st.columns([1, 1, 4])
+    with nav_cols[0]:
+        if len(logs) >= AUDIT_LOG_LIMIT:
+            st.button(
+                "Older entries",
+                on_click=set_audit_logs_window,
+                args=((logs[-1]['created_at'], logs[-1]['id']),)
+            )
+    with nav_cols[1]:
+        if filters.get('before'):
+            st.button("Back to newest entries", on_click=set_audit_logs_window, args=(None,))
\ No newline at end of file
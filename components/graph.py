@@ -1,81 +1,19 @@
 import streamlit as st
 from pyvis.network import Network
 import streamlit.components.v1 as components
-import tempfile
+from utils.cache import get_cached_tags
 
-def create_graph_visualization(entities, relationships):
-    # Graph visualization section
-    
-    # Instructions in collapsed expander
-    with st.expander("Graph Instructions", expanded=False):
-        st.markdown("""
-        - **Navigation**: Click and drag to move, scroll to zoom
-        - **Interaction**: Click nodes to view details
-        - **Relationships**: Hover over lines to see relationship types
-        - **Focus**: Double-click nodes to focus on their connections
-        """)
-    
-    # Legend in collapsed expander
-    with st.expander("Graph Legend", expanded=False):
-        cols = st.columns(4)
-        with cols[0]:
-            st.markdown('<span style="display: inline-block; width: 12px; height: 12px; border-radius: 50%; background-color: #ff7f0e; margin-right: 5px;"></span> **Capability**', unsafe_allow_html=True)
-        with cols[1]:
-            st.markdown('<span style="display: inline-block; width: 12px; height: 12px; border-radius: 50%; background-color: #1f77b4; margin-right: 5px;"></span> **Use Case**', unsafe_allow_html=True)
-        with cols[2]:
-            st.markdown('<span style="display: inline-block; width: 12px; height: 12px; border-radius: 50%; background-color: #2ca02c; margin-right: 5px;"></span> **Tool**', unsafe_allow_html=True)
-        with cols[3]:
-            st.markdown('<span style="display: inline-block; width: 12px; height: 12px; border-radius: 50%; background-color: #d62728; margin-right: 5px;"></span> **Product**', unsafe_allow_html=True)
-    
-    # Add full screen toggle button
-    _, button_col = st.columns([6, 1])
-    with button_col:
-        if st.button(
-            ("Exit Full Screen" if st.session_state.graph_fullscreen else "View Full Screen"),
-            help="Toggle between full screen and normal view",
-            use_container_width=True
-        ):
-            st.session_state.graph_fullscreen = not st.session_state.graph_fullscreen
-            st.rerun()
+# Node colors keyed by lowercased entity type
+ENTITY_COLORS = {
+    "capability": "#ff7f0e",
+    "use case": "#1f77b4",
+    "tool": "#2ca02c",
+    "product": "#d62728"
+}
+DEFAULT_ENTITY_COLOR = "#808080"
 
-    # Create network
-    net = Network(height="600px", width="100%", bgcolor="#ffffff", font_color="#333333")
-    
-    # Add nodes
-    entity_colors = {
-        "capability": "#ff7f0e",
-        "use case": "#1f77b4",  # Fixed use case color mapping
-        "tool": "#2ca02c",
-        "product": "#d62728"
-    }
-    
-    # Add nodes and track existing node IDs
-    existing_node_ids = set()
-    for entity in entities:
-        net.add_node(
-            entity['id'],
-            label=entity['name'],
-            title=f"{entity['type']}: {entity['description']}",
-            color=entity_colors.get(entity['type'].lower(), "#gray"),
-            size=30
-        )
-        existing_node_ids.add(entity['id'])
-    
-    # Add edges only between existing nodes
-    for rel in relationships:
-        source_id = rel['source_id']
-        target_id = rel['target_id']
-        
-        # Only create edge if both nodes exist in our filtered set
-        if source_id in existing_node_ids and target_id in existing_node_ids:
-            net.add_edge(
-                source_id,
-                target_id,
-                title=f"{rel['relationship_type']}\n{rel['source_name']} → {rel['target_name']}"
-            )
-    
-    # Set network options with properly formatted JSON
-    net.set_options('''{
+# pyvis network options, shared by every graph render
+NET_OPTIONS = '''{
     "physics": {
         "stabilization": {
             "iterations": 100,
@@ -111,58 +49,174 @@ def create_graph_visualization(entities, relationships):
         "hover": true,
         "tooltipDelay": 200
     }
-}''')
+}'''
+
+@st.cache_data(show_spinner=False)
+def build_graph_html(entity_sig, rel_sig):
+    """Build the pyvis graph HTML, cached on the nodes and edges it draws.
+    
+    Args:
+        entity_sig: Tuple of (id, name, type, description) per entity
+        rel_sig: Tuple of (source_id, target_id, relationship_type,
+            source_name, target_name) per relationship
+    """
+    # Create network
+    net = Network(height="600px", width="100%", bgcolor="#ffffff", font_color="#333333")
+    
+    # Resolve each distinct entity type's color once rather than per node
+    type_colors = {
+        entity_type: ENTITY_COLORS.get(entity_type.lower(), DEFAULT_ENTITY_COLOR)
+        for entity_type in {entity[2] for entity in entity_sig}
+    }
+    existing_node_ids = {entity[0] for entity in entity_sig}
+    
+    # Assign the node list in bulk, in the same shape pyvis' add_node
+    # would build one call at a time
+    net.nodes = [
+        {
+            "id": entity_id,
+            "label": name,
+            "shape": "dot",
+            "title": f"{entity_type}: {description}",
+            "color": type_colors[entity_type],
+            "size": 30,
+            "font": {"color": net.font_color}
+        }
+        for entity_id, name, entity_type, description in entity_sig
+    ]
+    net.node_ids = [node["id"] for node in net.nodes]
+    net.node_map = {node["id"]: node for node in net.nodes}
+    
+    # Relationships are already filtered to the entity set in the database;
+    # the membership check only guards against the entity and relationship
+    # caches briefly disagreeing. Like add_edge on this undirected network,
+    # only the first edge between a pair of nodes is drawn, whichever way
+    # round it points.
+    seen_pairs = set()
+    net.edges = []
+    for source_id, target_id, relationship_type, source_name, target_name in rel_sig:
+        if source_id not in existing_node_ids or target_id not in existing_node_ids:
+            continue
+        pair = frozenset((source_id, target_id))
+        if pair in seen_pairs:
+            continue
+        seen_pairs.add(pair)
+        net.edges.append({
+            "from": source_id,
+            "to": target_id,
+            "title": f"{relationship_type}\n{source_name} → {target_name}"
+        })
     
-    # Generate HTML file
-    with tempfile.NamedTemporaryFile(delete=False, suffix='.html') as tmp_file:
-        net.save_graph(tmp_file.name)
-        with open(tmp_file.name, 'r', encoding='utf-8') as f:
-            components.html(f.read(), height=600)
+    net.set_options(NET_OPTIONS)
+    
+    # Generate the HTML in memory
+    return net.generate_html(notebook=False)
 
-def display_graph_filters():
-    st.sidebar.header("Filters")
+def create_graph_visualization(entities, relationships):
+    # Graph visualization section
     
-    # Entity type filter with count
-    entity_types = ["All", "Capability", "Use Case", "Tool", "Product"]
-    selected_type = st.sidebar.selectbox("Entity Type", entity_types)
+    # Instructions in collapsed expander
+    with st.expander("Graph Instructions", expanded=False):
+        st.markdown("""
+        - **Navigation**: Click and drag to move, scroll to zoom
+        - **Interaction**: Click nodes to view details
+        - **Relationships**: Hover over lines to see relationship types
+        - **Focus**: Double-click nodes to focus on their connections
+        """)
     
-    # Enhanced search with multiple fields
-    st.sidebar.subheader("Search")
-    search_type = st.sidebar.radio("Search In:", ["Name", "Description", "All Fields"])
-    search_term = st.sidebar.text_input(
-        "Search Term", 
-        help="Search in entity names, descriptions, and metadata"
+    # Legend in collapsed expander
+    with st.expander("Graph Legend", expanded=False):
+        cols = st.columns(4)
+        with cols[0]:
+            st.markdown('<span style="display: inline-block; width: 12px; height: 12px; border-radius: 50%; background-color: #ff7f0e; margin-right: 5px;"></span> **Capability**', unsafe_allow_html=True)
+        with cols[1]:
+            st.markdown('<span style="display: inline-block; width: 12px; height: 12px; border-radius: 50%; background-color: #1f77b4; margin-right: 5px;"></span> **Use Case**', unsafe_allow_html=True)
+        with cols[2]:
+            st.markdown('<span style="display: inline-block; width: 12px; height: 12px; border-radius: 50%; background-color: #2ca02c; margin-right: 5px;"></span> **Tool**', unsafe_allow_html=True)
+        with cols[3]:
+            st.markdown('<span style="display: inline-block; width: 12px; height: 12px; border-radius: 50%; background-color: #d62728; margin-right: 5px;"></span> **Product**', unsafe_allow_html=True)
+    
+    # Add full screen toggle button
+    _, button_col = st.columns([6, 1])
+    with button_col:
+        if st.button(
+            ("Exit Full Screen" if st.session_state.graph_fullscreen else "View Full Screen"),
+            help="Toggle between full screen and normal view",
+            use_container_width=True
+        ):
+            st.session_state.graph_fullscreen = not st.session_state.graph_fullscreen
+            st.rerun()
+
+    # Build (or reuse) the graph HTML from the fields it actually draws
+    entity_sig = tuple(
+        (entity['id'], entity['name'], entity['type'], entity['description'])
+        for entity in entities
+    )
+    rel_sig = tuple(
+        (rel['source_id'], rel['target_id'], rel['relationship_type'],
+         rel['source_name'], rel['target_name'])
+        for rel in relationships
     )
     
-    # Tags filter with select all option
-    from models.entities import EntityManager
-    available_tags = EntityManager.get_tags()
-    if available_tags:
-        st.sidebar.subheader("Tags")
-        select_all = st.sidebar.checkbox("Select All Tags")
-        if select_all:
-            selected_tags = available_tags
-        else:
-            selected_tags = st.sidebar.multiselect("Select Tags", available_tags)
-    else:
-        selected_tags = []
+    # Reruns that only change other state (e.g. the selected entity) reuse
+    # this session's last graph without a cache lookup
+    graph_sig = hash((entity_sig, rel_sig))
+    if st.session_state.get('graph_html_sig') != graph_sig:
+        st.session_state.graph_html = build_graph_html(entity_sig, rel_sig)
+        st.session_state.graph_html_sig = graph_sig
+    components.html(st.session_state.graph_html, height=600)
+
+def display_graph_filters():
+    """Render the catalog filters in a sidebar form.
     
-    # Advanced filters
-    with st.sidebar.expander("Advanced Filters"):
-        show_relationships = st.checkbox("Show Relationships", True)
-        min_connections = st.slider("Minimum Connections", 0, 10, 0)
-        relationship_types = st.multiselect(
-            "Relationship Types",
-            ["enables", "implemented by", "uses", "supports", "powered by", "delivers"]
-        )
+    Widgets inside the form only report new values when Apply is pressed,
+    so the graph is requeried once per set of filter changes.
+    """
+    st.sidebar.header("Filters")
+    
+    with st.sidebar.form("catalog_filters"):
+        # Entity type filter with count
+        entity_types = ["All", "Capability", "Use Case", "Tool", "Product"]
+        selected_type = st.selectbox("Entity Type", entity_types)
         
-    # Date range filter
-    with st.sidebar.expander("Date Filter"):
-        date_filter = st.date_input(
-            "Created After",
-            value=None,
-            help="Filter entities created after this date"
+        # Enhanced search with multiple fields
+        st.subheader("Search")
+        search_type = st.radio("Search In:", ["Name", "Description", "All Fields"])
+        search_term = st.text_input(
+            "Search Term", 
+            help="Search in entity names, descriptions, and metadata"
         )
+        
+        # Tags filter with select all option; both widgets are shown because
+        # form widgets cannot change each other until the form is submitted
+        available_tags = get_cached_tags()
+        if available_tags:
+            st.subheader("Tags")
+            select_all = st.checkbox("Select All Tags")
+            selected_tags = st.multiselect("Select Tags", available_tags)
+            if select_all:
+                selected_tags = available_tags
+        else:
+            selected_tags = []
+        
+        # Advanced filters
+        with st.expander("Advanced Filters"):
+            show_relationships = st.checkbox("Show Relationships", True)
+            min_connections = st.slider("Minimum Connections", 0, 10, 0)
+            relationship_types = st.multiselect(
+                "Relationship Types",
+                ["enables", "implemented by", "uses", "supports", "powered by", "delivers"]
+            )
+            
+        # Date range filter
+        with st.expander("Date Filter"):
+            date_filter = st.date_input(
+                "Created After",
+                value=None,
+                help="Filter entities created after this date"
+            )
+        
+        st.form_submit_button("Apply Filters", use_container_width=True)
     
     return {
         "type": selected_type,
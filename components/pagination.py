@@ -0,0 +1,31 @@
+import math
+import streamlit as st
+
+PAGE_SIZES = [25, 50, 100]
+
+def paginate(items, key):
+    """Render page controls and return the items on the selected page.
+
+    Args:
+        items: Full list of items to page through
+        key: Prefix for the widget keys, unique per list on the page
+    """
+    if len(items) <= PAGE_SIZES[0]:
+        return items
+
+    col1, col2, _ = st.columns([1, 1, 4])
+    with col1:
+        page_size = st.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_page_size")
+
+    total_pages = math.ceil(len(items) / page_size)
+    page_key = f"{key}_page"
+    # Clamp a stale page number left over from a longer list or smaller page size
+    if st.session_state.get(page_key, 1) > total_pages:
+        st.session_state[page_key] = total_pages
+
+    with col2:
+        page = st.number_input("Page", min_value=1, max_value=total_pages, step=1, key=page_key)
+
+    st.caption(f"Page {page} of {total_pages} ({len(items)} total)")
+    start = (page - 1) * page_size
+    return items[start:start + page_size]
@@ -1,21 +1,30 @@
+import logging
 import streamlit as st
 from components.graph import create_graph_visualization, display_graph_filters
 from components.admin import render_admin_interface
 from components.entity_details import show_entity_details
 from components.home import render_home_page
 from components.capabilities import render_capabilities_page
-from models.entities import EntityManager
+from utils.cache import get_cached_entities, get_cached_relationships
 from utils.auth import check_password
 
+# Debug logging from the audit and auth helpers stays off unless enabled here
+logging.basicConfig(level=logging.INFO)
+
 st.set_page_config(
     page_title="Enterprise Architecture Catalog",
     page_icon="🏢",
     layout="wide"
 )
 
-def load_css():
+@st.cache_resource
+def read_css():
+    """Read the stylesheet once per process."""
     with open('assets/styles.css') as f:
-        st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+        return f.read()
+
+def load_css():
+    st.markdown(f'<style>{read_css()}</style>', unsafe_allow_html=True)
 
 # Load CSS
 load_css()
@@ -24,145 +33,127 @@ load_css()
 if 'selected_entity' not in st.session_state:
     st.session_state.selected_entity = None
 
-def main():
-    # Top navigation
-    st.markdown('<div class="nav-container">', unsafe_allow_html=True)
+@st.fragment
+def render_catalog_graph(entities, relationships):
+    """Render the catalog graph and its summary line as a fragment.
     
-    # Get current page
-    current_page = st.query_params.get("page", "Home")
+    Interacting with the graph controls only reruns this section, not the
+    navigation bar or the filter sidebar.
+    """
+    create_graph_visualization(entities, relationships)
+    st.info(f"Showing {len(entities)} entities and {len(relationships)} relationships")
+
+def render_catalog_page():
+    st.title("Enterprise Architecture Catalog")
+    # Get enhanced filters
+    filters = display_graph_filters()
     
-    cols = st.columns([6,1,1,1,1])  # Balanced spacing
+    # Get filtered data with enhanced parameters
+    entities = get_cached_entities(
+        entity_type=filters["type"],
+        search_term=filters["search"],
+        search_type=filters["search_type"],
+        tags=tuple(filters["tags"]),
+        date_filter=filters["date_filter"],
+        relationship_types=tuple(filters["relationship_types"]),
+        min_connections=filters["min_connections"]
+    )
     
-    _, col1, col2, col3, col4 = cols
+    relationships = get_cached_relationships(
+        entity_type=filters["type"],
+        search_term=filters["search"],
+        search_type=filters["search_type"],
+        tags=tuple(filters["tags"]),
+        date_filter=filters["date_filter"],
+        relationship_types=tuple(filters["relationship_types"]),
+        min_connections=filters["min_connections"]
+    ) if filters["show_relationships"] else []
     
-    with col1:
-        if st.button("Home", key="nav_home", 
-                    help="Go to Home page",
-                    use_container_width=True,
-                    type="primary" if current_page == "Home" else "secondary"):
-            st.query_params["page"] = "Home"
-            st.rerun()
+    # Initialize fullscreen state if not exists
+    if 'graph_fullscreen' not in st.session_state:
+        st.session_state.graph_fullscreen = False
+
+    if not entities:
+        st.warning("No entities found matching the current filters.")
+    else:
+        if st.session_state.graph_fullscreen:
+            # Full screen mode - create visualization directly
+            render_catalog_graph(entities, relationships)
+            
+            # Show entity details in the sidebar when in fullscreen
+            if st.session_state.selected_entity:
+                with st.sidebar:
+                    show_entity_details(st.session_state.selected_entity)
+        else:
+            # Normal split view - create visualization in left column
+            col1, col2 = st.columns([7, 3])
+            with col1:
+                render_catalog_graph(entities, relationships)
+            
+            if st.session_state.selected_entity:
+                with col2:
+                    show_entity_details(st.session_state.selected_entity)
+            
+            # Add filter summary (shown in both modes)
+            with st.expander("Active Filters"):
+                if filters["type"] != "All":
+                    st.write(f"Type: {filters['type']}")
+                if filters["search"]:
+                    st.write(f"Search: '{filters['search']}' in {filters['search_type']}")
+                if filters["tags"]:
+                    st.write(f"Tags: {', '.join(filters['tags'])}")
+                if filters["relationship_types"]:
+                    st.write(f"Relationship Types: {', '.join(filters['relationship_types'])}")
+                if filters["date_filter"]:
+                    st.write(f"Created After: {filters['date_filter']}")
+
+def render_admin_page():
+    # First check if already authenticated
+    if "admin_role" in st.session_state and st.session_state["admin_role"]:
+        render_admin_interface()
+    # If not authenticated, try to authenticate
+    elif check_password():
+        render_admin_interface()
+    # Authentication failed or not attempted yet
+    else:
+        st.stop()
+
+# Pages in top navigation order
+PAGES = [
+    st.Page(render_home_page, title="Home", default=True),
+    st.Page(render_catalog_page, title="Catalog", url_path="catalog"),
+    st.Page(render_capabilities_page, title="Capabilities", url_path="capabilities"),
+    st.Page(render_admin_page, title="Admin", url_path="admin")
+]
+NAV_HELP = {
+    "Home": "Go to Home page",
+    "Catalog": "View Enterprise Catalog",
+    "Capabilities": "View Enterprise Capabilities",
+    "Admin": "Access Admin Dashboard"
+}
+
+def main():
+    # Streamlit's page router switches pages on the client; the built-in
+    # sidebar menu is hidden in favour of the top navigation links
+    current_page = st.navigation(PAGES, position="hidden")
     
-    with col2:
-        if st.button("Catalog", key="nav_catalog",
-                    help="View Enterprise Catalog",
-                    use_container_width=True,
-                    type="primary" if current_page == "Catalog" else "secondary"):
-            st.query_params["page"] = "Catalog"
-            st.rerun()
+    # Top navigation
+    st.markdown('<div class="nav-container">', unsafe_allow_html=True)
     
-    with col3:
-        if st.button("Capabilities", key="nav_capabilities",
-                    help="View Enterprise Capabilities",
-                    use_container_width=True,
-                    type="primary" if current_page == "Capabilities" else "secondary"):
-            st.query_params["page"] = "Capabilities"
-            st.rerun()
+    cols = st.columns([6,1,1,1,1])  # Balanced spacing
     
-    with col4:
-        if st.button("Admin", key="nav_admin",
-                    help="Access Admin Dashboard",
-                    use_container_width=True,
-                    type="primary" if current_page == "Admin" else "secondary"):
-            st.query_params["page"] = "Admin"
-            st.rerun()
+    for col, page in zip(cols[1:], PAGES):
+        with col:
+            st.page_link(
+                page,
+                help=NAV_HELP[page.title],
+                use_container_width=True,
+                disabled=page.url_path == current_page.url_path
+            )
     
     st.markdown('</div>', unsafe_allow_html=True)
     
-    # Get the current page from query parameters
-    page = st.query_params.get("page", "Home")
-    
-    if page == "Home":
-        render_home_page()
-    
-    elif page == "Capabilities":
-        render_capabilities_page()
-    
-    elif page == "Catalog":
-        st.title("Enterprise Architecture Catalog")
-        # Get enhanced filters
-        filters = display_graph_filters()
-        
-        # Get filtered data with enhanced parameters
-        entities = EntityManager.get_entities(
-            entity_type=filters["type"],
-            search_term=filters["search"],
-            search_type=filters["search_type"],
-            tags=filters["tags"],
-            date_filter=filters["date_filter"],
-            relationship_types=filters["relationship_types"]
-        )
-        
-        relationships = EntityManager.get_relationships(
-            entity_type=filters["type"],
-            search_term=filters["search"],
-            relationship_types=filters["relationship_types"]
-        ) if filters["show_relationships"] else []
-        
-        # Filter based on minimum connections if specified
-        if filters["min_connections"] > 0:
-            entity_connections = {}
-            for rel in relationships:
-                entity_connections[rel['source_id']] = entity_connections.get(rel['source_id'], 0) + 1
-                entity_connections[rel['target_id']] = entity_connections.get(rel['target_id'], 0) + 1
-            
-            entities = [e for e in entities if entity_connections.get(e['id'], 0) >= filters["min_connections"]]
-        
-        # Initialize fullscreen state if not exists
-        if 'graph_fullscreen' not in st.session_state:
-            st.session_state.graph_fullscreen = False
-
-        if not entities:
-            st.warning("No entities found matching the current filters.")
-        else:
-            if st.session_state.graph_fullscreen:
-                # Full screen mode - create visualization directly
-                create_graph_visualization(entities, relationships)
-                st.info(f"Showing {len(entities)} entities and {len(relationships)} relationships")
-                
-                # Show entity details in the sidebar when in fullscreen
-                if st.session_state.selected_entity:
-                    with st.sidebar:
-                        show_entity_details(st.session_state.selected_entity)
-            else:
-                # Normal split view - create visualization in left column
-                col1, col2 = st.columns([7, 3])
-                with col1:
-                    create_graph_visualization(entities, relationships)
-                    st.info(f"Showing {len(entities)} entities and {len(relationships)} relationships")
-                
-                if st.session_state.selected_entity:
-                    with col2:
-                        show_entity_details(st.session_state.selected_entity)
-                
-                # Add filter summary (shown in both modes)
-                with st.expander("Active Filters"):
-                    if filters["type"] != "All":
-                        st.write(f"Type: {filters['type']}")
-                    if filters["search"]:
-                        st.write(f"Search: '{filters['search']}' in {filters['search_type']}")
-                    if filters["tags"]:
-                        st.write(f"Tags: {', '.join(filters['tags'])}")
-                    if filters["relationship_types"]:
-                        st.write(f"Relationship Types: {', '.join(filters['relationship_types'])}")
-                    if filters["date_filter"]:
-                        st.write(f"Created After: {filters['date_filter']}")
-        
-        if not st.session_state.graph_fullscreen:
-            with col2:
-                if st.session_state.selected_entity:
-                    show_entity_details(st.session_state.selected_entity)
-    
-    elif page == "Admin":
-        # First check if already authenticated
-        if "admin_role" in st.session_state and st.session_state["admin_role"]:
-            render_admin_interface()
-        # If not authenticated, try to authenticate
-        elif check_password():
-            render_admin_interface()
-        # Authentication failed or not attempted yet
-        else:
-            st.stop()
+    current_page.run()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,14 @@
+"""Create the upcoming monthly audit_logs partitions.
+
+Schedule this outside the app, e.g. a daily cron job, so a partition always
+exists before its month starts. Entries that already landed in
+audit_logs_default are moved into their month's partition, which briefly
+locks audit_logs, so run it off-peak.
+"""
+from models.database import db
+
+if __name__ == "__main__":
+    try:
+        db.maintain_partitions()
+    finally:
+        db.close()
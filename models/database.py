@@ -1,146 +1,514 @@
 import os
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2.extensions import connection as PGConnection
+from psycopg2.pool import ThreadedConnectionPool, PoolError
+from contextlib import contextmanager
+from datetime import date, timedelta
+import threading
 import time
 
-class Database:
-    def __init__(self):
-        self.conn = None
-        self.connect_with_retry()
-        self.create_tables()
+# Pooled connections idle longer than this are checked with SELECT 1 before
+# reuse, since the server or a proxy may have dropped them in the meantime
+IDLE_CHECK_SECONDS = 30
 
-    def connect_with_retry(self, max_retries=5):
-        """Establish database connection with retry mechanism"""
-        retry_count = 0
-        while retry_count < max_retries:
-            try:
-                self.conn = psycopg2.connect(
-                    database=os.getenv('PGDATABASE'),
-                    user=os.getenv('PGUSER'),
-                    password=os.getenv('PGPASSWORD'),
-                    host=os.getenv('PGHOST'),
-                    port=os.getenv('PGPORT')
+# When every pooled connection is in use, callers wait this long for one to
+# be returned instead of failing straight away
+CHECKOUT_TIMEOUT = 5
+
+# Schema changes take this advisory lock so concurrent workers starting at
+# once apply the DDL one after another instead of racing on it
+SCHEMA_LOCK_NAME = 'arch_portal_schema'
+
+# Schema changes are applied by running bootstrap.py before starting the app;
+# RUN_MIGRATIONS=1 makes app processes also run the schema check on first connect
+RUN_MIGRATIONS = os.getenv('RUN_MIGRATIONS', '0') == '1'
+
+# Hot single-row statements, prepared once per connection on first use so
+# the server parses and plans them only once
+PREPARED_STATEMENTS = {
+    "insert_entity": """
+        INSERT INTO entities (name, type, description, metadata)
+        VALUES ($1, $2, $3, $4::jsonb)
+        RETURNING id
+    """,
+    "upsert_tag": """
+        INSERT INTO tags (name)
+        VALUES ($1)
+        ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+        RETURNING id
+    """,
+    "link_entity_tag": """
+        INSERT INTO entity_tags (entity_id, tag_id)
+        VALUES ($1, $2)
+        ON CONFLICT DO NOTHING
+    """,
+    "insert_relationship": """
+        INSERT INTO relationships (source_id, target_id, relationship_type)
+        VALUES ($1, $2, $3)
+    """,
+    "select_admin_ids": """
+        SELECT username, id
+        FROM admins
+        WHERE username = ANY($1)
+    """,
+    "select_admin_login": """
+        SELECT id, role, password_hash, login_attempts, is_active,
+               GREATEST(0, $2 - EXTRACT(EPOCH FROM (NOW() - last_login_attempt)))::int AS lockout_remaining
+        FROM admins WHERE username = $1
+    """,
+    "complete_login": """
+        UPDATE admins 
+        SET login_attempts = 0,
+            last_login = CURRENT_TIMESTAMP,
+            password_hash = COALESCE($3, password_hash)
+        WHERE username = $1 AND password_hash = $2
+        RETURNING id, role
+    """
+}
+
+class PreparingConnection(PGConnection):
+    """Connection that remembers which PREPARED_STATEMENTS it has prepared"""
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+def execute_prepared(cur, name, params):
+    """Execute one of PREPARED_STATEMENTS, preparing it on this connection first if needed"""
+    conn = cur.connection
+    if name not in conn.prepared:
+        cur.execute(f"PREPARE {name} AS {PREPARED_STATEMENTS[name]}")
+        conn.prepared.add(name)
+    placeholders = ', '.join(['%s'] * len(params))
+    cur.execute(f"EXECUTE {name} ({placeholders})", params)
+
+def copy_csv_row(values):
+    """Format values as one line for COPY ... WITH (FORMAT csv).
+    
+    None becomes an unquoted empty field, which COPY reads as NULL, while
+    every other value is quoted, so an empty string or a literal \\N stays text.
+    """
+    return ','.join(
+        '' if value is None else '"' + str(value).replace('"', '""') + '"'
+        for value in values
+    ) + '\n'
+
+# Indexes on audit_logs, created on the partitioned table and so on every partition
+AUDIT_LOG_INDEXES = (
+    "idx_audit_logs_created_at",
+    "idx_audit_logs_admin_id_created_at",
+    "idx_audit_logs_action_type_created_at"
+)
+
+# Monthly audit_logs partitions are created this many months ahead of the
+# current one; entries outside every monthly partition go to audit_logs_default
+AUDIT_PARTITION_MONTHS_AHEAD = 3
+
+def ensure_audit_log_partitions(cur, months_ahead=AUDIT_PARTITION_MONTHS_AHEAD):
+    """Create the audit_logs_YYYY_MM partitions for this month and the next months_ahead.
+    
+    Months with entries already in the default partition also get their own
+    partition, with those entries moved into it. A month already covered by
+    another partition, such as a converted legacy table, is skipped.
+    """
+    month = date.today().replace(day=1)
+    months = set()
+    for _ in range(months_ahead + 1):
+        months.add(month)
+        month = (month + timedelta(days=32)).replace(day=1)
+    
+    cur.execute("SELECT to_regclass('audit_logs_default') IS NOT NULL")
+    has_default = cur.fetchone()[0]
+    if has_default:
+        cur.execute("SELECT DISTINCT date_trunc('month', created_at)::date FROM audit_logs_default")
+        months.update(row[0] for row in cur.fetchall())
+    
+    for month in sorted(months):
+        partition = f"audit_logs_{month:%Y_%m}"
+        cur.execute("SELECT to_regclass(%s) IS NOT NULL", (partition,))
+        if cur.fetchone()[0]:
+            continue
+        next_month = (month + timedelta(days=32)).replace(day=1)
+        cur.execute("SAVEPOINT audit_log_partition")
+        try:
+            moved = False
+            if has_default:
+                cur.execute(
+                    "SELECT EXISTS (SELECT 1 FROM audit_logs_default WHERE created_at >= %s AND created_at < %s)",
+                    (month, next_month)
                 )
-                print("Database connection established successfully!")
-                return
-            except psycopg2.OperationalError as e:
-                retry_count += 1
-                if retry_count == max_retries:
-                    raise Exception(f"Failed to connect to database after {max_retries} attempts: {str(e)}")
-                print(f"Connection attempt {retry_count} failed, retrying in 2 seconds...")
-                time.sleep(2)
+                moved = cur.fetchone()[0]
+            if moved:
+                # A new partition can't overlap rows already in the default
+                # one, so the default is detached while they are moved across
+                cur.execute("ALTER TABLE audit_logs DETACH PARTITION audit_logs_default")
+            cur.execute(
+                f"""
+                CREATE TABLE {partition}
+                PARTITION OF audit_logs FOR VALUES FROM (%s) TO (%s)
+                """,
+                (month, next_month)
+            )
+            if moved:
+                cur.execute(
+                    f"""
+                    INSERT INTO {partition}
+                    SELECT * FROM audit_logs_default WHERE created_at >= %s AND created_at < %s
+                    """,
+                    (month, next_month)
+                )
+                cur.execute(
+                    "DELETE FROM audit_logs_default WHERE created_at >= %s AND created_at < %s",
+                    (month, next_month)
+                )
+                moved_count = cur.rowcount
+                cur.execute("ALTER TABLE audit_logs ATTACH PARTITION audit_logs_default DEFAULT")
+                print(f"Moved {moved_count} audit log entries for {month:%Y-%m} out of audit_logs_default")
+            cur.execute("RELEASE SAVEPOINT audit_log_partition")
+        except psycopg2.Error as e:
+            cur.execute("ROLLBACK TO SAVEPOINT audit_log_partition")
+            print(f"Skipping audit log partition for {month:%Y-%m}: {str(e)}")
+    cur.execute("CREATE TABLE IF NOT EXISTS audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+def maintain_audit_log_partitions(conn):
+    """Create upcoming audit_logs partitions, as maintain_partitions.py does.
+    
+    Takes the schema advisory lock, so runs overlapping each other or
+    create_schema wait their turn. Does nothing until audit_logs has been
+    partitioned.
+    """
+    with conn.cursor() as cur:
+        cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (SCHEMA_LOCK_NAME,))
+        cur.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('audit_logs')")
+        row = cur.fetchone()
+        if row is not None and row[0] == 'p':
+            ensure_audit_log_partitions(cur)
 
-    def ensure_connection(self):
-        """Ensure database connection is alive and reconnect if necessary"""
+def create_schema(conn, convert_legacy_audit_logs=False):
+    """Create necessary database tables if they don't exist.
+
+    Runs in one transaction holding the schema advisory lock, which is
+    released when the transaction commits or rolls back. An audit_logs table
+    created before partitioning is only converted when
+    convert_legacy_audit_logs is set, as bootstrap.py does; app processes
+    leave it as it is.
+    """
+    with conn.cursor() as cur:
         try:
-            with self.conn.cursor() as cur:
-                cur.execute('SELECT 1')
-        except (psycopg2.OperationalError, psycopg2.InterfaceError, AttributeError):
-            print("Database connection lost, reconnecting...")
-            self.connect_with_retry()
+            cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (SCHEMA_LOCK_NAME,))
 
-    def create_tables(self):
-        """Create necessary database tables if they don't exist"""
-        self.ensure_connection()
-        with self.conn.cursor() as cur:
+            # Create entities table
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS entities (
+                    id SERIAL PRIMARY KEY,
+                    name VARCHAR(255) NOT NULL,
+                    type VARCHAR(50) NOT NULL,
+                    description TEXT,
+                    metadata JSONB,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Index the type and creation date filters used by entity listings
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_entities_type_created_at
+                ON entities (type, created_at)
+            """)
+            
+            # Date range filters without a type can't use the composite index
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_entities_created_at
+                ON entities (created_at)
+            """)
+            
+            # Trigram indexes let the name/description ILIKE searches use an
+            # index; pg_trgm may be unavailable, so they are optional
+            cur.execute("SAVEPOINT trigram_indexes")
             try:
-                # Create entities table
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS entities (
-                        id SERIAL PRIMARY KEY,
-                        name VARCHAR(255) NOT NULL,
-                        type VARCHAR(50) NOT NULL,
-                        description TEXT,
-                        metadata JSONB,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
-                """)
-                
-                # Create relationships table
+                cur.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
                 cur.execute("""
-                    CREATE TABLE IF NOT EXISTS relationships (
-                        id SERIAL PRIMARY KEY,
-                        source_id INTEGER REFERENCES entities(id) ON DELETE CASCADE,
-                        target_id INTEGER REFERENCES entities(id) ON DELETE CASCADE,
-                        relationship_type VARCHAR(50),
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
+                    CREATE INDEX IF NOT EXISTS idx_entities_name_trgm
+                    ON entities USING gin (name gin_trgm_ops)
                 """)
-                
-                # Create tags table
                 cur.execute("""
-                    CREATE TABLE IF NOT EXISTS tags (
-                        id SERIAL PRIMARY KEY,
-                        name VARCHAR(50) NOT NULL UNIQUE
-                    )
+                    CREATE INDEX IF NOT EXISTS idx_entities_description_trgm
+                    ON entities USING gin (description gin_trgm_ops)
                 """)
-                
-                # Create entity_tags table
-                cur.execute("""
-                    CREATE TABLE IF NOT EXISTS entity_tags (
-                        entity_id INTEGER REFERENCES entities(id) ON DELETE CASCADE,
-                        tag_id INTEGER REFERENCES tags(id) ON DELETE CASCADE,
-                        PRIMARY KEY (entity_id, tag_id)
-                    )
-                """)
-                
-                # Create admins table
+                cur.execute("RELEASE SAVEPOINT trigram_indexes")
+            except psycopg2.Error as e:
+                cur.execute("ROLLBACK TO SAVEPOINT trigram_indexes")
+                print(f"Skipping trigram search indexes: {str(e)}")
+            
+            # Create relationships table
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS relationships (
+                    id SERIAL PRIMARY KEY,
+                    source_id INTEGER REFERENCES entities(id) ON DELETE CASCADE,
+                    target_id INTEGER REFERENCES entities(id) ON DELETE CASCADE,
+                    relationship_type VARCHAR(50),
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # Index both endpoints for relationship lookups and joins
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_relationships_source_id
+                ON relationships (source_id)
+            """)
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_relationships_target_id
+                ON relationships (target_id)
+            """)
+            
+            # Create tags table
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS tags (
+                    id SERIAL PRIMARY KEY,
+                    name VARCHAR(50) NOT NULL UNIQUE
+                )
+            """)
+            
+            # Create entity_tags table
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS entity_tags (
+                    entity_id INTEGER REFERENCES entities(id) ON DELETE CASCADE,
+                    tag_id INTEGER REFERENCES tags(id) ON DELETE CASCADE,
+                    PRIMARY KEY (entity_id, tag_id)
+                )
+            """)
+            
+            # The primary key covers lookups by entity; index tag lookups too
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_entity_tags_tag_id
+                ON entity_tags (tag_id)
+            """)
+            
+            # Create admins table
+            cur.execute("""
+                CREATE TABLE IF NOT EXISTS admins (
+                    id SERIAL PRIMARY KEY,
+                    username VARCHAR(50) NOT NULL UNIQUE,
+                    password_hash TEXT NOT NULL,
+                    role VARCHAR(20) NOT NULL CHECK (role IN ('admin', 'super_admin')),
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
+            
+            # scrypt hashes don't fit the VARCHAR(64) used for SHA-256 digests.
+            # Only widen a column that still needs it, since the ALTER locks
+            # admins against logins even when there is nothing to change
+            cur.execute("""
+                SELECT data_type FROM information_schema.columns
+                WHERE table_schema = current_schema()
+                AND table_name = 'admins' AND column_name = 'password_hash'
+            """)
+            if cur.fetchone() == ('character varying',):
                 cur.execute("""
-                    CREATE TABLE IF NOT EXISTS admins (
-                        id SERIAL PRIMARY KEY,
-                        username VARCHAR(50) NOT NULL UNIQUE,
-                        password_hash VARCHAR(64) NOT NULL,
-                        role VARCHAR(20) NOT NULL CHECK (role IN ('admin', 'super_admin')),
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
+                    ALTER TABLE admins ALTER COLUMN password_hash TYPE TEXT
                 """)
+            
+            # Create audit_logs table, range-partitioned by month on created_at
+            # so date filters only scan the months they cover and old months
+            # can be dropped whole
+            cur.execute("SELECT relkind FROM pg_class WHERE oid = to_regclass('audit_logs')")
+            row = cur.fetchone()
+            legacy_audit_logs = row is not None and row[0] == 'r'
+            if legacy_audit_logs and not convert_legacy_audit_logs:
+                print("audit_logs is not partitioned yet; run bootstrap.py to convert it")
+            else:
+                if legacy_audit_logs:
+                    # A table created before partitioning is renamed and attached
+                    # as one partition holding all of its rows, from MINVALUE up
+                    # to the next month. Those rows can't be dropped month by
+                    # month, only all at once with audit_logs_legacy.
+                    cur.execute("ALTER TABLE audit_logs RENAME TO audit_logs_legacy")
+                    cur.execute("ALTER TABLE audit_logs_legacy RENAME CONSTRAINT audit_logs_pkey TO audit_logs_legacy_pkey")
+                    # Free the index names for the partitioned table's indexes,
+                    # which are built on the legacy partition once it is attached
+                    for index in AUDIT_LOG_INDEXES:
+                        cur.execute(f"DROP INDEX IF EXISTS {index}")
+                    # The partition key can't be NULL
+                    cur.execute("UPDATE audit_logs_legacy SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL")
+                    cur.execute("ALTER TABLE audit_logs_legacy ALTER COLUMN created_at SET NOT NULL")
                 
-                # Create audit_logs table
+                # The id sequence is shared with, and carries on from, a legacy table
+                cur.execute("CREATE SEQUENCE IF NOT EXISTS audit_logs_id_seq")
                 cur.execute("""
                     CREATE TABLE IF NOT EXISTS audit_logs (
-                        id SERIAL PRIMARY KEY,
+                        id INTEGER NOT NULL DEFAULT nextval('audit_logs_id_seq'),
                         admin_id INTEGER REFERENCES admins(id),
                         admin_role VARCHAR(20) NOT NULL,
                         action_type VARCHAR(50) NOT NULL,
                         entity_type VARCHAR(50),
                         entity_id INTEGER,
                         details JSONB,
-                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                    )
+                        created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                        PRIMARY KEY (id, created_at)
+                    ) PARTITION BY RANGE (created_at)
                 """)
+                cur.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+                
+                if legacy_audit_logs:
+                    cur.execute("""
+                        SELECT date_trunc('month', GREATEST(LOCALTIMESTAMP, MAX(created_at))) + INTERVAL '1 month'
+                        FROM audit_logs_legacy
+                    """)
+                    cur.execute(
+                        "ALTER TABLE audit_logs ATTACH PARTITION audit_logs_legacy FOR VALUES FROM (MINVALUE) TO (%s)",
+                        (cur.fetchone()[0],)
+                    )
                 
-                self.conn.commit()
-                print("Database tables created successfully!")
-            except Exception as e:
-                self.conn.rollback()
-                raise Exception(f"Error creating tables: {str(e)}")
+                ensure_audit_log_partitions(cur)
+            
+            # Index the recent-activity count and the newest-first log listing
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_audit_logs_created_at
+                ON audit_logs (created_at)
+            """)
+            
+            # Audit log listings filtered by admin or action, newest first
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_audit_logs_admin_id_created_at
+                ON audit_logs (admin_id, created_at DESC)
+            """)
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_audit_logs_action_type_created_at
+                ON audit_logs (action_type, created_at DESC)
+            """)
+            
+            conn.commit()
+            print("Database tables created successfully!")
+        except Exception as e:
+            conn.rollback()
+            raise Exception(f"Error creating tables: {str(e)}")
+
+class Database:
+    def __init__(self, minconn=2, maxconn=20):
+        # The pool is opened on first use so importing the app never
+        # touches the database
+        self.pool = None
+        self._minconn = minconn
+        self._maxconn = maxconn
+        self._pool_lock = threading.Lock()
+        # One slot per connection the pool may hand out
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._last_used = {}
+
+    def _ensure_pool(self, migrate=RUN_MIGRATIONS):
+        """Open the connection pool on first use, creating the schema first if migrate is set"""
+        if self.pool is not None:
+            return
+        with self._pool_lock:
+            if self.pool is not None:
+                return
+            pool = self.connect_with_retry(self._minconn, self._maxconn)
+            if migrate:
+                conn = pool.getconn()
+                try:
+                    create_schema(conn)
+                finally:
+                    pool.putconn(conn)
+            self.pool = pool
+
+    def connect_with_retry(self, minconn=2, maxconn=20, max_retries=5):
+        """Create and return a connection pool with retry mechanism"""
+        retry_count = 0
+        while retry_count < max_retries:
+            try:
+                pool = ThreadedConnectionPool(
+                    minconn,
+                    maxconn,
+                    connection_factory=PreparingConnection,
+                    database=os.getenv('PGDATABASE'),
+                    user=os.getenv('PGUSER'),
+                    password=os.getenv('PGPASSWORD'),
+                    host=os.getenv('PGHOST'),
+                    port=os.getenv('PGPORT')
+                )
+                print("Database connection pool established successfully!")
+                return pool
+            except psycopg2.OperationalError as e:
+                retry_count += 1
+                if retry_count == max_retries:
+                    raise Exception(f"Failed to connect to database after {max_retries} attempts: {str(e)}")
+                print(f"Connection attempt {retry_count} failed, retrying in 2 seconds...")
+                time.sleep(2)
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection for the duration of a with block.
+        
+        Commits when the block exits normally and rolls back when it raises.
+        A connection that failed at the network level is closed instead of
+        being returned to the pool, so the next caller gets a fresh one.
+        Raises PoolError if none frees up within CHECKOUT_TIMEOUT seconds.
+        """
+        self._ensure_pool()
+        if not self._slots.acquire(timeout=CHECKOUT_TIMEOUT):
+            raise PoolError(f"No database connection available within {CHECKOUT_TIMEOUT} seconds")
+        try:
+            conn = self._checkout()
+            broken = False
+            try:
+                yield conn
+                if not conn.closed:
+                    conn.commit()
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                broken = True
+                raise
+            except Exception:
+                if not conn.closed:
+                    conn.rollback()
+                raise
+            finally:
+                self._checkin(conn, close=broken or bool(conn.closed))
+        finally:
+            self._slots.release()
+
+    def _checkout(self):
+        """Take a connection from the pool, replacing it once if it went stale"""
+        conn = self.pool.getconn()
+        last_used = self._last_used.get(id(conn))
+        if conn.closed or (last_used and time.monotonic() - last_used > IDLE_CHECK_SECONDS):
+            try:
+                with conn.cursor() as cur:
+                    cur.execute('SELECT 1')
+            except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                print("Database connection lost, reconnecting...")
+                self._checkin(conn, close=True)
+                conn = self.pool.getconn()
+        return conn
+
+    def _checkin(self, conn, close=False):
+        """Return a connection to the pool, recording when it was last used"""
+        if close:
+            self._last_used.pop(id(conn), None)
+        else:
+            self._last_used[id(conn)] = time.monotonic()
+        self.pool.putconn(conn, close=close)
+
+    def create_tables(self, convert_legacy_audit_logs=False):
+        """Create necessary database tables if they don't exist"""
+        self._ensure_pool(migrate=False)
+        with self.connection() as conn:
+            create_schema(conn, convert_legacy_audit_logs)
+
+    def maintain_partitions(self):
+        """Create upcoming audit_logs partitions and move entries out of the default one"""
+        self._ensure_pool(migrate=False)
+        with self.connection() as conn:
+            maintain_audit_log_partitions(conn)
 
     def close(self):
-        """Close the database connection"""
-        if self.conn:
-            self.conn.close()
-            self.conn = None
+        """Close every pooled connection"""
+        if self.pool:
+            self.pool.closeall()
+            self.pool = None
 
 _db_instance = Database()
 
-def get_db_connection():
-    """Get a database connection from the pool"""
-    try:
-        _db_instance.ensure_connection()
-        if not _db_instance.conn:
-            print("ERROR: No database connection available")
-            return None
-        # Test connection
-        with _db_instance.conn.cursor() as cur:
-            cur.execute('SELECT 1')
-            if not cur.fetchone():
-                raise Exception("Database connection test failed")
-        return _db_instance.conn
-    except Exception as e:
-        print(f"Error getting database connection: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
-        return None
+def get_conn():
+    """Borrow a connection from the shared pool; use as a context manager"""
+    return _db_instance.connection()
 
 db = _db_instance  # Keep backward compatibility
@@ -1,87 +1,301 @@
-from psycopg2.extras import RealDictCursor
-from .database import db
+from psycopg2.extras import RealDictCursor, execute_values
+from .database import get_conn, execute_prepared, copy_csv_row
 from datetime import datetime
+from contextlib import contextmanager
+import csv
+import io
 import json
 from collections import defaultdict
 
+# Batches larger than this are streamed to the server with COPY instead of
+# a multi-row INSERT
+COPY_THRESHOLD = 100
+
+# Rows fetched per round trip when streaming large result sets
+FETCH_ITERSIZE = 500
+
+def _encode_metadata(metadata):
+    """Validate entity metadata and encode it for a JSONB column."""
+    if metadata is None:
+        return None
+    if not isinstance(metadata, dict):
+        raise ValueError("Metadata must be a dictionary")
+    # JSONB keeps numbers and booleans as they are; readers format values
+    # when they display them
+    return json.dumps(metadata) if metadata else None
+
+def _entity_values(rows):
+    """Turn create_entities rows into (name, type, description, metadata) tuples."""
+    return [
+        (row["name"], row["entity_type"], row.get("description", ""),
+         row["metadata_json"] if "metadata_json" in row else _encode_metadata(row.get("metadata")))
+        for row in rows
+    ]
+
+def _copy_entities(cur, values):
+    """Load entity rows through COPY and return their (id, name) pairs.
+    
+    COPY cannot return generated keys, so rows are staged in a temporary
+    table and moved into entities with INSERT ... SELECT ... RETURNING.
+    """
+    buffer = io.StringIO()
+    for seq, row in enumerate(values):
+        buffer.write(copy_csv_row((seq,) + tuple(row)))
+    buffer.seek(0)
+
+    cur.execute("""
+        CREATE TEMP TABLE entities_stage (
+            seq INTEGER,
+            name VARCHAR(255),
+            type VARCHAR(50),
+            description TEXT,
+            metadata JSONB
+        )
+    """)
+    cur.copy_expert(
+        "COPY entities_stage (seq, name, type, description, metadata) FROM STDIN WITH (FORMAT csv)",
+        buffer
+    )
+    cur.execute("""
+        INSERT INTO entities (name, type, description, metadata)
+        SELECT name, type, description, metadata FROM entities_stage ORDER BY seq
+        RETURNING id, name
+    """)
+    created = cur.fetchall()
+    cur.execute("DROP TABLE entities_stage")
+    return created
+
+def _entity_filter_conditions(entity_type=None, search_term=None, search_type="Name", tags=None,
+                              date_filter=None, date_to=None, relationship_types=None, min_connections=0):
+    """Build the WHERE conditions and params for the entity filters.
+    
+    Conditions reference the entities table as e.
+    """
+    conditions = []
+    params = []
+    
+    if entity_type and entity_type != "All":
+        conditions.append("e.type = %s")
+        params.append(entity_type)
+        
+    if search_term:
+        like_pattern = f"%{search_term}%"
+        if search_type == "Name":
+            conditions.append("e.name ILIKE %s")
+            params.append(like_pattern)
+        elif search_type == "Description":
+            conditions.append("e.description ILIKE %s")
+            params.append(like_pattern)
+        else:  # All Fields
+            conditions.append("(e.name ILIKE %s OR e.description ILIKE %s)")
+            params.extend([like_pattern, like_pattern])
+            
+    if date_filter:
+        conditions.append("e.created_at >= %s")
+        params.append(date_filter)
+    
+    if date_to:
+        conditions.append("e.created_at <= %s")
+        params.append(date_to)
+        
+    if tags:
+        # Filter in a subquery so the entity's aggregated tags stay complete
+        conditions.append("""EXISTS (
+            SELECT 1
+            FROM entity_tags ft_et
+            JOIN tags ft ON ft.id = ft_et.tag_id
+            WHERE ft_et.entity_id = e.id AND ft.name = ANY(%s)
+        )""")
+        params.append(list(tags))
+    
+    if min_connections > 0:
+        # Count each relationship once per endpoint so only entities
+        # with enough connections are returned
+        degree_filter = ""
+        if relationship_types:
+            degree_filter = "WHERE relationship_type = ANY(%s)"
+            params.append(list(relationship_types))
+        conditions.append(f"""e.id IN (
+            SELECT entity_id
+            FROM (
+                SELECT source_id AS entity_id, relationship_type FROM relationships
+                UNION ALL
+                SELECT target_id AS entity_id, relationship_type FROM relationships
+            ) endpoints
+            {degree_filter}
+            GROUP BY entity_id
+            HAVING COUNT(*) >= %s
+        )""")
+        params.append(min_connections)
+    
+    return conditions, params
+
+def _stream_rows(query, params, cursor_name, error_message):
+    """Yield the rows of a query through a server-side cursor.
+    
+    Rows arrive FETCH_ITERSIZE at a time instead of the whole result being
+    buffered at once, and are yielded as plain dicts built from tuples with
+    the column names read once per query. Errors are reported and re-raised,
+    even after some rows were yielded, so a truncated result is never taken
+    for a complete one or cached as such.
+    """
+    try:
+        with get_conn() as conn, conn.cursor(name=cursor_name) as cur:
+            cur.itersize = FETCH_ITERSIZE
+            cur.execute(query, params)
+            columns = None
+            for row in cur:
+                # A named cursor only describes its columns after the first fetch
+                if columns is None:
+                    columns = [column.name for column in cur.description]
+                yield dict(zip(columns, row))
+    except Exception as e:
+        print(f"{error_message}: {str(e)}")
+        raise
+
 class EntityManager:
     @staticmethod
-    def create_entity(name, entity_type, description="", metadata=None):
-        """Create a new entity with proper metadata handling."""
-        db.ensure_connection()
-        with db.conn.cursor() as cur:
+    @contextmanager
+    def transaction():
+        """Yield a cursor whose writes are committed together on exit.
+        
+        Bulk methods accepting a ``cur`` argument skip their own commit when
+        given this cursor, so several of them can share one transaction.
+        The pooled connection commits on exit and rolls back on error.
+        """
+        with get_conn() as conn, conn.cursor() as cur:
+            yield cur
+
+    @staticmethod
+    def create_entity(name, entity_type, description="", metadata=None, tags=None):
+        """Create a new entity with proper metadata handling.
+        
+        Tags given here are upserted and linked by the same statement that
+        inserts the entity, so creating a tagged entity takes one round trip.
+        """
+        with get_conn() as conn, conn.cursor() as cur:
             try:
-                # Ensure metadata is a valid dictionary
-                if metadata is not None:
-                    if not isinstance(metadata, dict):
-                        raise ValueError("Metadata must be a dictionary")
-                    # Convert all values to strings for consistent handling
-                    metadata = {k: str(v) if not isinstance(v, (list, dict)) else v 
-                              for k, v in metadata.items()}
-                
-                json_metadata = json.dumps(metadata) if metadata else None
+                json_metadata = _encode_metadata(metadata)
                 
-                cur.execute(
-                    "INSERT INTO entities (name, type, description, metadata) VALUES (%s, %s, %s, %s::jsonb) RETURNING id",
-                    (name, entity_type, description, json_metadata)
-                )
+                if tags:
+                    cur.execute(
+                        '''
+                        WITH created AS (
+                            INSERT INTO entities (name, type, description, metadata)
+                            VALUES (%s, %s, %s, %s::jsonb)
+                            RETURNING id
+                        ), upserted AS (
+                            INSERT INTO tags (name)
+                            SELECT DISTINCT unnest(%s::text[])
+                            ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+                            RETURNING id
+                        ), linked AS (
+                            INSERT INTO entity_tags (entity_id, tag_id)
+                            SELECT created.id, upserted.id FROM created CROSS JOIN upserted
+                        )
+                        SELECT id FROM created
+                        ''',
+                        (name, entity_type, description, json_metadata, list(tags))
+                    )
+                else:
+                    execute_prepared(cur, "insert_entity", (name, entity_type, description, json_metadata))
                 entity_id = cur.fetchone()[0]
-                db.conn.commit()
+                conn.commit()
                 return entity_id
             except (json.JSONDecodeError, ValueError) as e:
-                db.conn.rollback()
+                conn.rollback()
                 raise ValueError(f"Invalid metadata format: {str(e)}")
             except Exception as e:
-                db.conn.rollback()
+                conn.rollback()
                 raise Exception(f"Error creating entity: {str(e)}")
 
+    @staticmethod
+    def create_entities(rows, cur=None):
+        """Create several entities with a single multi-row INSERT.
+        
+        Batches larger than COPY_THRESHOLD are loaded with copy_entities instead.
+        
+        Args:
+            rows: List of dicts with name, entity_type, description and either
+                metadata (a dict) or metadata_json (already encoded JSON text)
+            cur: Optional cursor from transaction(); commits immediately when omitted
+            
+        Returns:
+            Dict mapping each created entity's name to its generated id
+        """
+        if not rows:
+            return {}
+        if len(rows) > COPY_THRESHOLD:
+            return EntityManager.copy_entities(rows, cur)
+        if cur is None:
+            with EntityManager.transaction() as cur:
+                return EntityManager.create_entities(rows, cur)
+        try:
+            values = _entity_values(rows)
+            created = execute_values(
+                cur,
+                "INSERT INTO entities (name, type, description, metadata) VALUES %s RETURNING id, name",
+                values,
+                template="(%s, %s, %s, %s::jsonb)",
+                page_size=len(values),
+                fetch=True
+            )
+            return {name: entity_id for entity_id, name in created}
+        except (json.JSONDecodeError, ValueError) as e:
+            raise ValueError(f"Invalid metadata format: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error creating entities: {str(e)}")
+
+    @staticmethod
+    def copy_entities(rows, cur=None):
+        """Create several entities by streaming them to the server with COPY.
+        
+        Meant for seeders and bulk imports; takes the same rows and returns the
+        same name to id mapping as create_entities.
+        """
+        if not rows:
+            return {}
+        if cur is None:
+            with EntityManager.transaction() as cur:
+                return EntityManager.copy_entities(rows, cur)
+        try:
+            created = _copy_entities(cur, _entity_values(rows))
+            return {name: entity_id for entity_id, name in created}
+        except (json.JSONDecodeError, ValueError) as e:
+            raise ValueError(f"Invalid metadata format: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Error creating entities: {str(e)}")
+
     @staticmethod
     def get_tags():
-        db.ensure_connection()
-        with db.conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with get_conn() as conn, conn.cursor() as cur:
             try:
                 cur.execute("SELECT name FROM tags ORDER BY name")
-                return [tag['name'] for tag in cur.fetchall()]
+                return [name for (name,) in cur.fetchall()]
             except Exception as e:
                 print(f"Error fetching tags: {str(e)}")
                 return []
 
     @staticmethod
     def add_tag(entity_id, tag_name):
-        db.ensure_connection()
-        with db.conn.cursor() as cur:
+        with get_conn() as conn, conn.cursor() as cur:
             try:
                 # First, insert or get the tag
-                cur.execute(
-                    '''
-                    INSERT INTO tags (name)
-                    VALUES (%s)
-                    ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
-                    RETURNING id
-                    ''',
-                    (tag_name,)
-                )
+                execute_prepared(cur, "upsert_tag", (tag_name,))
                 tag_id = cur.fetchone()[0]
                 
                 # If entity_id is provided, create the entity-tag relationship
                 if entity_id is not None:
-                    cur.execute(
-                        '''
-                        INSERT INTO entity_tags (entity_id, tag_id)
-                        VALUES (%s, %s)
-                        ON CONFLICT DO NOTHING
-                        ''',
-                        (entity_id, tag_id)
-                    )
+                    execute_prepared(cur, "link_entity_tag", (entity_id, tag_id))
                 
-                db.conn.commit()
+                conn.commit()
                 return tag_id
             except Exception as e:
-                db.conn.rollback()
+                conn.rollback()
                 raise Exception(f"Error adding tag: {str(e)}")
 
     @staticmethod
-    def get_entities(entity_type=None, search_term=None, search_type="Name", tags=None, date_filter=None, date_to=None, relationship_types=None):
+    def get_entities(entity_type=None, search_term=None, search_type="Name", tags=None, date_filter=None, date_to=None, relationship_types=None, min_connections=0):
         """Get entities with optional filtering.
         
         Args:
@@ -92,177 +306,161 @@ class EntityManager:
             date_filter: Filter entities created after this date
             date_to: Filter entities created before this date
             relationship_types: Filter by relationship types
+            min_connections: Only return entities with at least this many
+                relationships, counting only the given relationship types
+        
+        Returns:
+            Generator of entity rows, streamed from a server-side cursor
         """
-        db.ensure_connection()
-        with db.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            try:
-                query = '''
-                    SELECT DISTINCT e.*, array_agg(t.name) FILTER (WHERE t.name IS NOT NULL) as tags
-                    FROM entities e
-                    LEFT JOIN entity_tags et ON e.id = et.entity_id
-                    LEFT JOIN tags t ON et.tag_id = t.id
-                '''
-                
-                conditions = []
-                params = []
-                
-                if entity_type and entity_type != "All":
-                    conditions.append("e.type = %s")
-                    params.append(entity_type)
-                    
-                if search_term:
-                    if search_type == "Name":
-                        conditions.append("e.name ILIKE %s")
-                        params.append(f"%{search_term}%")
-                    elif search_type == "Description":
-                        conditions.append("e.description ILIKE %s")
-                        params.append(f"%{search_term}%")
-                    else:  # All Fields
-                        conditions.append("(e.name ILIKE %s OR e.description ILIKE %s)")
-                        params.extend([f"%{search_term}%", f"%{search_term}%"])
-                        
-                if date_filter:
-                    conditions.append("e.created_at >= %s")
-                    params.append(date_filter)
-                
-                if date_to:
-                    conditions.append("e.created_at <= %s")
-                    params.append(date_to)
-                    
-                if tags:
-                    placeholders = ', '.join(['%s'] * len(tags))
-                    conditions.append(f"t.name IN ({placeholders})")
-                    params.extend(tags)
-                
-                if conditions:
-                    query += " WHERE " + " AND ".join(conditions)
-                    
-                query += " GROUP BY e.id ORDER BY e.name"
-                
-                cur.execute(query, params)
-                return cur.fetchall()
-                
-            except Exception as e:
-                print(f"Error fetching entities: {str(e)}")
-                return []
+        # Tags are aggregated per entity in a subquery, so no join
+        # fan-out needs collapsing with DISTINCT/GROUP BY
+        query = '''
+            SELECT e.*,
+                   COALESCE((
+                       SELECT array_agg(t.name ORDER BY t.name)
+                       FROM entity_tags et
+                       JOIN tags t ON t.id = et.tag_id
+                       WHERE et.entity_id = e.id
+                   ), '{}') AS tags
+            FROM entities e
+        '''
+        
+        conditions, params = _entity_filter_conditions(
+            entity_type, search_term, search_type, tags,
+            date_filter, date_to, relationship_types, min_connections
+        )
+        
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+            
+        query += " ORDER BY e.name"
+        
+        return _stream_rows(query, params, "entities_scroll", "Error fetching entities")
 
     @staticmethod
     def update_entity(entity_id, description=None):
-        db.ensure_connection()
-        with db.conn.cursor() as cur:
+        with get_conn() as conn, conn.cursor() as cur:
             try:
                 if description is not None:
                     cur.execute(
                         "UPDATE entities SET description = %s WHERE id = %s",
                         (description, entity_id)
                     )
-                db.conn.commit()
+                conn.commit()
             except Exception as e:
-                db.conn.rollback()
+                conn.rollback()
                 raise Exception(f"Error updating entity: {str(e)}")
 
     @staticmethod
     def update_entity_tags(entity_id, new_tags):
-        db.ensure_connection()
-        with db.conn.cursor() as cur:
+        with get_conn() as conn, conn.cursor() as cur:
             try:
-                # Remove existing tags
-                cur.execute("DELETE FROM entity_tags WHERE entity_id = %s", (entity_id,))
-                
-                # Add new tags
-                for tag_name in new_tags:
-                    # First ensure the tag exists
-                    cur.execute(
-                        '''
+                # Upsert the new tags, link any the entity lacks and unlink the
+                # ones no longer listed, all in one statement. The unlinked and
+                # linked rows never overlap, so the CTEs can't trip over each other
+                tags = list(new_tags or [])
+                cur.execute(
+                    '''
+                    WITH upserted AS (
                         INSERT INTO tags (name)
-                        VALUES (%s)
+                        SELECT DISTINCT unnest(%s::text[])
                         ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
                         RETURNING id
-                        ''',
-                        (tag_name,)
-                    )
-                    tag_id = cur.fetchone()[0]
-                    
-                    # Create entity-tag relationship
-                    cur.execute(
-                        "INSERT INTO entity_tags (entity_id, tag_id) VALUES (%s, %s)",
-                        (entity_id, tag_id)
+                    ), removed AS (
+                        DELETE FROM entity_tags et
+                        USING tags t
+                        WHERE et.entity_id = %s
+                        AND t.id = et.tag_id
+                        AND NOT t.name = ANY(%s)
                     )
+                    INSERT INTO entity_tags (entity_id, tag_id)
+                    SELECT %s, id FROM upserted
+                    ON CONFLICT DO NOTHING
+                    ''',
+                    (tags, entity_id, tags, entity_id)
+                )
                 
-                db.conn.commit()
+                conn.commit()
             except Exception as e:
-                db.conn.rollback()
+                conn.rollback()
                 raise Exception(f"Error updating entity tags: {str(e)}")
 
     @staticmethod
     def delete_entity(entity_id):
-        db.ensure_connection()
-        with db.conn.cursor() as cur:
+        with get_conn() as conn, conn.cursor() as cur:
             try:
                 cur.execute("DELETE FROM entities WHERE id = %s", (entity_id,))
-                db.conn.commit()
+                conn.commit()
             except Exception as e:
-                db.conn.rollback()
+                conn.rollback()
                 raise Exception(f"Error deleting entity: {str(e)}")
 
     @staticmethod
-    def get_relationships(entity_type=None, search_term=None, relationship_types=None):
-        db.ensure_connection()
-        with db.conn.cursor(cursor_factory=RealDictCursor) as cur:
-            try:
-                query = '''
-                    SELECT r.*, 
-                           s.name as source_name, 
-                           t.name as target_name
-                    FROM relationships r
-                    JOIN entities s ON r.source_id = s.id
-                    JOIN entities t ON r.target_id = t.id
-                '''
-                
-                conditions = []
-                params = []
-                
-                if entity_type and entity_type != "All":
-                    conditions.append("(s.type = %s OR t.type = %s)")
-                    params.extend([entity_type, entity_type])
-                    
-                if search_term:
-                    conditions.append("(s.name ILIKE %s OR t.name ILIKE %s)")
-                    params.extend([f"%{search_term}%", f"%{search_term}%"])
-                    
-                if relationship_types:
-                    placeholders = ', '.join(['%s'] * len(relationship_types))
-                    conditions.append(f"r.relationship_type IN ({placeholders})")
-                    params.extend(relationship_types)
-                
-                if conditions:
-                    query += " WHERE " + " AND ".join(conditions)
-                    
-                query += " ORDER BY r.created_at DESC"
-                
-                cur.execute(query, params)
-                return cur.fetchall()
-                
-            except Exception as e:
-                print(f"Error fetching relationships: {str(e)}")
-                return []
+    def get_relationships(entity_type=None, search_term=None, relationship_types=None, search_type="Name",
+                          tags=None, date_filter=None, date_to=None, min_connections=0):
+        """Get relationships whose source and target both match the entity filters.
+        
+        Takes the same filters as get_entities, so the result holds exactly
+        the edges between the entities get_entities returns. Like
+        get_entities, rows are streamed from a server-side cursor.
+        """
+        conditions, params = _entity_filter_conditions(
+            entity_type, search_term, search_type, tags,
+            date_filter, date_to, relationship_types, min_connections
+        )
+        
+        query = '''
+            WITH filtered AS (
+                SELECT e.id
+                FROM entities e
+        '''
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += '''
+            )
+            SELECT r.*, 
+                   s.name as source_name, 
+                   t.name as target_name
+            FROM relationships r
+            JOIN filtered fs ON fs.id = r.source_id
+            JOIN filtered ft ON ft.id = r.target_id
+            JOIN entities s ON r.source_id = s.id
+            JOIN entities t ON r.target_id = t.id
+        '''
+            
+        if relationship_types:
+            query += " WHERE r.relationship_type = ANY(%s)"
+            params.append(list(relationship_types))
+            
+        query += " ORDER BY r.created_at DESC"
+        
+        return _stream_rows(query, params, "relationships_scroll", "Error fetching relationships")
 
     @staticmethod
     def get_entity_relationships(entity_id):
-        db.ensure_connection()
-        with db.conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with get_conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
             try:
+                # One indexed lookup per endpoint instead of an OR across both;
+                # a self-relationship is only returned by the first branch
                 cur.execute("""
                     SELECT r.id,
-                           r.relationship_type, 
-                           CASE WHEN r.source_id = %s THEN t.name ELSE s.name END as related_entity_name,
-                           CASE WHEN r.source_id = %s THEN t.id ELSE s.id END as related_entity_id,
-                           r.source_id = %s as is_source
+                           r.relationship_type,
+                           t.name AS related_entity_name,
+                           t.id AS related_entity_id,
+                           TRUE AS is_source
                     FROM relationships r
-                    JOIN entities s ON r.source_id = s.id
                     JOIN entities t ON r.target_id = t.id
-                    WHERE r.source_id = %s OR r.target_id = %s
-                """, (entity_id, entity_id, entity_id, entity_id, entity_id))
+                    WHERE r.source_id = %(id)s
+                    UNION ALL
+                    SELECT r.id,
+                           r.relationship_type,
+                           s.name AS related_entity_name,
+                           s.id AS related_entity_id,
+                           FALSE AS is_source
+                    FROM relationships r
+                    JOIN entities s ON r.source_id = s.id
+                    WHERE r.target_id = %(id)s AND r.source_id <> r.target_id
+                """, {'id': entity_id})
                 return cur.fetchall()
             except Exception as e:
                 print(f"Error fetching relationships: {str(e)}")
@@ -270,8 +468,7 @@ class EntityManager:
 
     @staticmethod
     def get_entity_tags(entity_id):
-        db.ensure_connection()
-        with db.conn.cursor(cursor_factory=RealDictCursor) as cur:
+        with get_conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
             try:
                 cur.execute("""
                     SELECT t.* FROM tags t
@@ -283,79 +480,209 @@ class EntityManager:
                 print(f"Error fetching entity tags: {str(e)}")
                 return []
 
+    @staticmethod
+    def get_entity_bundle(entity_id):
+        """Get an entity with its relationships and tags in one query.
+        
+        Returns:
+            Dict with the entity row under 'entity', rows shaped like
+            get_entity_relationships under 'relationships' and rows shaped
+            like get_entity_tags under 'tags', or None if the entity is missing
+        """
+        with get_conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            try:
+                cur.execute("""
+                    SELECT to_jsonb(e) AS entity,
+                           COALESCE((
+                               SELECT jsonb_agg(jsonb_build_object(
+                                   'id', r.id,
+                                   'relationship_type', r.relationship_type,
+                                   'related_entity_name', CASE WHEN r.source_id = e.id THEN t.name ELSE s.name END,
+                                   'related_entity_id', CASE WHEN r.source_id = e.id THEN t.id ELSE s.id END,
+                                   'is_source', r.source_id = e.id
+                               ))
+                               FROM relationships r
+                               JOIN entities s ON r.source_id = s.id
+                               JOIN entities t ON r.target_id = t.id
+                               WHERE r.source_id = e.id OR r.target_id = e.id
+                           ), '[]'::jsonb) AS relationships,
+                           COALESCE((
+                               SELECT jsonb_agg(to_jsonb(tg))
+                               FROM tags tg
+                               JOIN entity_tags et ON tg.id = et.tag_id
+                               WHERE et.entity_id = e.id
+                           ), '[]'::jsonb) AS tags
+                    FROM entities e
+                    WHERE e.id = %s
+                """, (entity_id,))
+                return cur.fetchone()
+            except Exception as e:
+                print(f"Error fetching entity details: {str(e)}")
+                return None
+
+    @staticmethod
+    def get_relationships_for_entities(entity_ids):
+        """Get the relationships of several entities in one query.
+        
+        Returns:
+            Dict mapping each entity id to rows shaped like get_entity_relationships
+        """
+        relationships = defaultdict(list)
+        if not entity_ids:
+            return relationships
+        with get_conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            try:
+                cur.execute("""
+                    SELECT r.source_id AS entity_id,
+                           r.id,
+                           r.relationship_type,
+                           t.name AS related_entity_name,
+                           t.id AS related_entity_id,
+                           TRUE AS is_source
+                    FROM relationships r
+                    JOIN entities t ON r.target_id = t.id
+                    WHERE r.source_id = ANY(%s)
+                    UNION ALL
+                    SELECT r.target_id AS entity_id,
+                           r.id,
+                           r.relationship_type,
+                           s.name AS related_entity_name,
+                           s.id AS related_entity_id,
+                           FALSE AS is_source
+                    FROM relationships r
+                    JOIN entities s ON r.source_id = s.id
+                    WHERE r.target_id = ANY(%s) AND r.source_id <> r.target_id
+                """, (list(entity_ids), list(entity_ids)))
+                for row in cur.fetchall():
+                    relationships[row.pop('entity_id')].append(row)
+                return relationships
+            except Exception as e:
+                print(f"Error fetching relationships: {str(e)}")
+                return defaultdict(list)
+
+    @staticmethod
+    def get_tags_for_entities(entity_ids):
+        """Get the tags of several entities in one query.
+        
+        Returns:
+            Dict mapping each entity id to rows shaped like get_entity_tags
+        """
+        tags = defaultdict(list)
+        if not entity_ids:
+            return tags
+        with get_conn() as conn, conn.cursor(cursor_factory=RealDictCursor) as cur:
+            try:
+                cur.execute("""
+                    SELECT et.entity_id, t.* FROM tags t
+                    JOIN entity_tags et ON t.id = et.tag_id
+                    WHERE et.entity_id = ANY(%s)
+                """, (list(entity_ids),))
+                for row in cur.fetchall():
+                    tags[row.pop('entity_id')].append(row)
+                return tags
+            except Exception as e:
+                print(f"Error fetching entity tags: {str(e)}")
+                return defaultdict(list)
+
     @staticmethod
     def create_relationship(source_id, target_id, relationship_type):
-        db.ensure_connection()
-        with db.conn.cursor() as cur:
+        with get_conn() as conn, conn.cursor() as cur:
             try:
-                cur.execute(
-                    "INSERT INTO relationships (source_id, target_id, relationship_type) VALUES (%s, %s, %s)",
-                    (source_id, target_id, relationship_type)
-                )
-                db.conn.commit()
+                execute_prepared(cur, "insert_relationship", (source_id, target_id, relationship_type))
+                conn.commit()
             except Exception as e:
-                db.conn.rollback()
+                conn.rollback()
                 raise Exception(f"Error creating relationship: {str(e)}")
 
+    @staticmethod
+    def create_relationships(relationships, cur=None):
+        """Create several relationships with a single multi-row INSERT.
+        
+        Args:
+            relationships: List of (source_id, target_id, relationship_type) tuples
+            cur: Optional cursor from transaction(); commits immediately when omitted
+        """
+        if not relationships:
+            return
+        if cur is None:
+            with EntityManager.transaction() as cur:
+                return EntityManager.create_relationships(relationships, cur)
+        try:
+            if len(relationships) > COPY_THRESHOLD:
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(relationships)
+                buffer.seek(0)
+                cur.copy_expert(
+                    "COPY relationships (source_id, target_id, relationship_type) FROM STDIN WITH (FORMAT csv)",
+                    buffer
+                )
+            else:
+                execute_values(
+                    cur,
+                    "INSERT INTO relationships (source_id, target_id, relationship_type) VALUES %s",
+                    relationships,
+                    page_size=len(relationships)
+                )
+        except Exception as e:
+            raise Exception(f"Error creating relationships: {str(e)}")
+
     @staticmethod
     def update_relationship(relationship_id, relationship_type):
-        db.ensure_connection()
-        with db.conn.cursor() as cur:
+        with get_conn() as conn, conn.cursor() as cur:
             try:
                 cur.execute(
                     "UPDATE relationships SET relationship_type = %s WHERE id = %s",
                     (relationship_type, relationship_id)
                 )
-                db.conn.commit()
+                conn.commit()
             except Exception as e:
-                db.conn.rollback()
+                conn.rollback()
                 raise Exception(f"Error updating relationship: {str(e)}")
 
     @staticmethod
     def delete_relationship(source_id, target_name):
-        db.ensure_connection()
-        with db.conn.cursor() as cur:
+        with get_conn() as conn, conn.cursor() as cur:
             try:
-                # First get the target entity id
-                cur.execute("SELECT id FROM entities WHERE name = %s", (target_name,))
-                target = cur.fetchone()
-                if target:
-                    target_id = target[0]
-                    # Delete the relationship
-                    cur.execute(
-                        "DELETE FROM relationships WHERE (source_id = %s AND target_id = %s) OR (source_id = %s AND target_id = %s)",
-                        (source_id, target_id, target_id, source_id)
-                    )
-                    db.conn.commit()
+                # Resolve the target by name and delete in one statement
+                cur.execute(
+                    """
+                    DELETE FROM relationships r
+                    USING entities e
+                    WHERE e.name = %s
+                      AND ((r.source_id = %s AND r.target_id = e.id)
+                        OR (r.source_id = e.id AND r.target_id = %s))
+                    """,
+                    (target_name, source_id, source_id)
+                )
+                conn.commit()
             except Exception as e:
-                db.conn.rollback()
+                conn.rollback()
                 raise Exception(f"Error deleting relationship: {str(e)}")
+
     @staticmethod
     def delete_multiple_entities(entity_ids):
         """Delete multiple entities at once."""
-        db.ensure_connection()
-        with db.conn.cursor() as cur:
+        with get_conn() as conn, conn.cursor() as cur:
             try:
                 cur.execute(
                     "DELETE FROM entities WHERE id = ANY(%s)",
                     (entity_ids,)
                 )
-                db.conn.commit()
+                conn.commit()
             except Exception as e:
-                db.conn.rollback()
+                conn.rollback()
                 raise Exception(f"Error deleting multiple entities: {str(e)}")
 
     @staticmethod
     def delete_multiple_relationships(relationship_ids):
         """Delete multiple relationships at once."""
-        db.ensure_connection()
-        with db.conn.cursor() as cur:
+        with get_conn() as conn, conn.cursor() as cur:
             try:
                 cur.execute(
                     "DELETE FROM relationships WHERE id = ANY(%s)",
                     (relationship_ids,)
                 )
-                db.conn.commit()
+                conn.commit()
             except Exception as e:
-                db.conn.rollback()
+                conn.rollback()
                 raise Exception(f"Error deleting multiple relationships: {str(e)}")
@@ -1,9 +1,6 @@
 from models.entities import EntityManager
 
 def add_sample_data():
-    # Dictionary to store entity IDs
-    entity_ids = {}
-    
     # Add Capabilities
     capabilities = [
         "Cloud Infrastructure Management",
@@ -11,8 +8,6 @@ def add_sample_data():
         "Security & Compliance",
         "API Management"
     ]
-    for cap in capabilities:
-        entity_ids[cap] = EntityManager.create_entity(cap, "Capability", f"Enterprise {cap} capability")
 
     # Add Use Cases
     use_cases = [
@@ -21,8 +16,6 @@ def add_sample_data():
         "Resource Monitoring",
         "API Gateway Integration"
     ]
-    for uc in use_cases:
-        entity_ids[uc] = EntityManager.create_entity(uc, "Use Case", f"{uc} use case")
 
     # Add Tools
     tools = [
@@ -31,8 +24,6 @@ def add_sample_data():
         "Elasticsearch",
         "Kong API Gateway"
     ]
-    for tool in tools:
-        entity_ids[tool] = EntityManager.create_entity(tool, "Tool", f"{tool} implementation")
 
     # Add Products
     products = [
@@ -41,11 +32,25 @@ def add_sample_data():
         "Mobile App",
         "Payment Gateway"
     ]
-    for product in products:
-        entity_ids[product] = EntityManager.create_entity(product, "Product", f"{product} solution")
 
-    # Create relationships
-    relationships = [
+    # One row per entity, so every entity is loaded with a single COPY
+    rows = (
+        [{"name": cap, "entity_type": "Capability", "description": f"Enterprise {cap} capability"} for cap in capabilities] +
+        [{"name": uc, "entity_type": "Use Case", "description": f"{uc} use case"} for uc in use_cases] +
+        [{"name": tool, "entity_type": "Tool", "description": f"{tool} implementation"} for tool in tools] +
+        [{"name": product, "entity_type": "Product", "description": f"{product} solution"} for product in products]
+    )
+
+    # Insert entities and relationships in one transaction with a single commit
+    with EntityManager.transaction() as cur:
+        entity_ids = EntityManager.copy_entities(rows, cur)
+        EntityManager.create_relationships(sample_relationships(entity_ids), cur)
+
+    print("Sample data added successfully!")
+
+def sample_relationships(entity_ids):
+    """Return the sample (source_id, target_id, relationship_type) triples."""
+    return [
         # Cloud Infrastructure Management relationships
         (entity_ids["Cloud Infrastructure Management"], entity_ids["Resource Monitoring"], "enables"),
         (entity_ids["Cloud Infrastructure Management"], entity_ids["AWS Cloud Services"], "implemented by"),
@@ -62,10 +67,5 @@ def add_sample_data():
         (entity_ids["API Management"], entity_ids["Customer Portal"], "supports")
     ]
 
-    for source_id, target_id, rel_type in relationships:
-        EntityManager.create_relationship(source_id, target_id, rel_type)
-
-    print("Sample data added successfully!")
-
 if __name__ == "__main__":
     add_sample_data()
@@ -123,6 +123,14 @@ else
     git clone https://github.com/yourusername/enterprise-catalog.git $INSTALL_DIR
 fi
 
+# Create the database schema
+print_status "Creating database schema..."
+(cd $INSTALL_DIR && PGHOST="$PGHOST" PGPORT="$PGPORT" PGDATABASE="$PGDATABASE" \
+    PGUSER="$PGUSER" PGPASSWORD="$PGPASSWORD" python3 bootstrap.py) || {
+    print_error "Failed to create database schema"
+    exit 1
+}
+
 # Configure Supervisor
 print_status "Configuring Supervisor..."
 cat > /etc/supervisor/conf.d/enterprise-catalog.conf << EOF
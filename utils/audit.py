@@ -1,10 +1,73 @@
 import json
+import logging
+import os
+import random
+import threading
+import time
 from datetime import datetime
-import psycopg2
-from psycopg2.extras import DictCursor
-from models.database import get_db_connection
+from functools import partial
+from psycopg2.extras import DictCursor, Json
+from models.database import get_conn
+from utils.audit_queue import enqueue_audit_record
 import streamlit as st
-import time
+
+logger = logging.getLogger(__name__)
+
+# AUDIT_ENABLED=0 turns audit logging off entirely, e.g. for bulk imports.
+# AUDIT_SAMPLE below 1 keeps only that fraction of the routine actions in
+# AUDIT_SAMPLED_ACTIONS; logins, deletions and anything else are always kept.
+AUDIT_ENABLED = os.getenv("AUDIT_ENABLED", "1") == "1"
+
+def _read_audit_sample():
+    """Parse AUDIT_SAMPLE, falling back to 1.0 if malformed and clamping it to [0, 1]."""
+    raw = os.getenv("AUDIT_SAMPLE", "1.0")
+    try:
+        sample = float(raw)
+    except ValueError:
+        sample = float("nan")
+    if sample != sample:
+        logger.warning("Ignoring invalid AUDIT_SAMPLE %r, auditing every action", raw)
+        return 1.0
+    if not 0 <= sample <= 1:
+        logger.warning("AUDIT_SAMPLE %r is outside [0, 1], clamping it", raw)
+        sample = min(max(sample, 0.0), 1.0)
+    return sample
+
+AUDIT_SAMPLE = _read_audit_sample()
+AUDIT_SAMPLED_ACTIONS = frozenset({
+    "create_entity", "update_entity", "create_relationship", "update_relationship"
+})
+
+# Audit log listings return at most this many entries per call, streamed from
+# the server AUDIT_FETCH_ITERSIZE rows at a time
+AUDIT_LOG_LIMIT = 1000
+AUDIT_FETCH_ITERSIZE = 1000
+
+# Details are serialized once, by the adapter when the writer inserts them;
+# values JSON can't represent, such as dates, are stored as their str()
+_dumps_details = partial(json.dumps, default=str)
+
+# Identical entries logged by the same admin within this many seconds, e.g.
+# by a rerun repeating the action that logged them, are only queued once
+AUDIT_DEDUP_SECONDS = 2
+AUDIT_DEDUP_MAXSIZE = 5000
+_recent_entries = {}
+_recent_entries_lock = threading.Lock()
+
+def _is_repeat_entry(key):
+    """Remember key and report whether it was already seen within AUDIT_DEDUP_SECONDS."""
+    now = time.monotonic()
+    with _recent_entries_lock:
+        seen_at = _recent_entries.get(key)
+        if seen_at is not None and now - seen_at < AUDIT_DEDUP_SECONDS:
+            return True
+        if len(_recent_entries) >= AUDIT_DEDUP_MAXSIZE:
+            for stale in [k for k, t in _recent_entries.items() if now - t >= AUDIT_DEDUP_SECONDS]:
+                del _recent_entries[stale]
+            if len(_recent_entries) >= AUDIT_DEDUP_MAXSIZE:
+                _recent_entries.clear()
+        _recent_entries[key] = now
+        return False
 
 def log_admin_action(action_type, entity_type=None, entity_id=None, details=None):
     """
@@ -15,19 +78,21 @@ def log_admin_action(action_type, entity_type=None, entity_id=None, details=None
         entity_type: Optional - Type of entity involved (e.g., 'Capability', 'Use Case', etc.)
         entity_id: Optional - ID of the entity involved
         details: Optional - Additional details about the action (will be stored as JSONB)
+    
+    Returns:
+        True once the entry is queued for the background writer (or was already
+        queued moments ago, or is not being logged), False otherwise
     """
-    conn = None
+    if not AUDIT_ENABLED:
+        return True
+    if AUDIT_SAMPLE < 1.0 and action_type in AUDIT_SAMPLED_ACTIONS and random.random() >= AUDIT_SAMPLE:
+        return True
+    
     try:
-        # Debug session state
-        print("\n=== Audit Logging Start ===")
-        print("Session State:")
-        for key, value in st.session_state.items():
-            print(f"{key}: {value}")
-        
         # Validate session state
         admin_role = st.session_state.get("admin_role")
         if not admin_role:
-            print("ERROR: No admin role in session")
+            logger.error("No admin role in session, audit entry not logged")
             return False
             
         # Get admin username with multiple fallback options
@@ -39,162 +104,104 @@ def log_admin_action(action_type, entity_type=None, entity_id=None, details=None
                 break
         
         if not admin_username:
-            print("ERROR: No admin username in session")
-            print(f"Available keys: {st.session_state.keys()}")
+            logger.error("No admin username in session, audit entry not logged")
             return False
             
-        # Validate and clean the details for JSON storage
-        if details:
-            try:
-                # Test JSON serialization
-                json.dumps(details)
-            except (TypeError, ValueError) as e:
-                print(f"WARNING: Invalid JSON in details: {e}")
-                details = str(details)  # Fallback to string representation
-            
-        print(f"\nLogging action: {action_type}")
-        print(f"Admin: {admin_username} ({admin_role})")
-        print(f"Entity: {entity_type} (ID: {entity_id})")
-        print(f"Details: {details}")
-        
-        # Get database connection with retry
-        retry_count = 0
-        while retry_count < 3 and not conn:
-            conn = get_db_connection()
-            if not conn:
-                retry_count += 1
-                print(f"Database connection attempt {retry_count} failed")
-                time.sleep(1)
-                
-        if not conn:
-            print("ERROR: Failed to establish database connection after 3 attempts")
-            return False
+        dedup_key = (
+            admin_username, action_type, entity_type, entity_id,
+            _dumps_details(details, sort_keys=True) if details else None
+        )
+        if _is_repeat_entry(dedup_key):
+            logger.debug("Skipping repeated %s entry by %s", action_type, admin_username)
+            return True
         
-        # Start transaction
-        conn.autocommit = False
+        logger.debug("Logging action %s by %s (%s) on %s %s",
+                     action_type, admin_username, admin_role, entity_type, entity_id)
         
-        try:
-            with conn.cursor(cursor_factory=DictCursor) as cur:
-                # Get admin_id
-                cur.execute("""
-                    SELECT id, username, role 
-                    FROM admins 
-                    WHERE username = %s
-                """, (admin_username,))
-                admin_result = cur.fetchone()
-                
-                if not admin_result:
-                    print(f"Error: No admin found with username: {admin_username}")
-                    return False
-                    
-                admin_id = admin_result['id']
-                
-                # Insert audit log
-                cur.execute("""
-                    INSERT INTO audit_logs 
-                    (admin_id, admin_role, action_type, entity_type, entity_id, details)
-                    VALUES (%s, %s, %s, %s, %s, %s)
-                    RETURNING id, created_at
-                """, (
-                    admin_id,
-                    admin_role,
-                    action_type,
-                    entity_type,
-                    entity_id,
-                    json.dumps(details) if details else None
-                ))
-                
-                log_result = cur.fetchone()
-                if not log_result:
-                    print("Error: Failed to create audit log entry")
-                    conn.rollback()
-                    return False
-                
-                # Commit transaction
-                conn.commit()
-                print(f"Successfully created audit log with ID: {log_result['id']} at {log_result['created_at']}")
-                return True
-                
-        except Exception as db_error:
-            if conn:
-                conn.rollback()
-            print(f"Database error in audit logging: {str(db_error)}")
-            import traceback
-            print(traceback.format_exc())
-            return False
+        # Hand the entry to the background writer, which resolves the admin
+        # and inserts queued entries in batches off the request path
+        record = {
+            'admin_id': st.session_state.get("admin_id"),
+            'admin_username': admin_username,
+            'admin_role': admin_role,
+            'action_type': action_type,
+            'entity_type': entity_type,
+            'entity_id': entity_id,
+            'details': Json(details, dumps=_dumps_details) if details else None,
+            'created_at': datetime.now()
+        }
+        return enqueue_audit_record(record)
             
     except Exception as e:
-        print(f"General error in audit logging: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
+        logger.exception("General error in audit logging: %s", e)
         return False
-        
-    finally:
-        if conn:
-            try:
-                conn.autocommit = True
-            except Exception:
-                pass
 
-def get_audit_logs(filters=None):
+def get_audit_logs(filters=None, limit=AUDIT_LOG_LIMIT):
     """
-    Retrieve audit logs with optional filtering.
+    Retrieve audit logs with optional filtering, newest first.
+    
+    Rows are streamed through a server-side cursor AUDIT_FETCH_ITERSIZE at a
+    time rather than fetched all at once.
     
     Args:
-        filters: Optional dict with filter parameters (admin_id, action_type, date_range, etc.)
+        filters: Optional dict with filter parameters (admin_id, action_type,
+            date_from, date_to, and before: the (created_at, id) of the last
+            entry already shown, to continue with the entries older than it)
+        limit: Only return this many entries, AUDIT_LOG_LIMIT by default
     
-    Returns:
-        List of audit log entries
+    Yields:
+        Audit log entries
+    """
+    query = """
+        SELECT 
+            al.id,
+            a.username as admin_username,
+            al.admin_role,
+            al.action_type,
+            al.entity_type,
+            al.entity_id,
+            al.details,
+            al.created_at
+        FROM audit_logs al
+        JOIN admins a ON al.admin_id = a.id
     """
+    
+    where_clauses = []
+    params = []
+    
+    if filters:
+        if filters.get('admin_id'):
+            where_clauses.append("al.admin_id = %s")
+            params.append(filters['admin_id'])
+        if filters.get('action_type') and filters['action_type'] != "All":
+            where_clauses.append("al.action_type = %s")
+            params.append(filters['action_type'])
+        if filters.get('date_from'):
+            where_clauses.append("al.created_at >= %s")
+            params.append(filters['date_from'])
+        if filters.get('date_to'):
+            where_clauses.append("al.created_at <= %s")
+            params.append(filters['date_to'])
+        if filters.get('before'):
+            # Keyset pagination: continue after the last entry shown
+            where_clauses.append("(al.created_at, al.id) < (%s, %s)")
+            params.extend(filters['before'])
+    
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+    
+    query += " ORDER BY al.created_at DESC, al.id DESC LIMIT %s"
+    params.append(limit)
+    
     try:
-        with get_db_connection() as conn:
-            with conn.cursor(cursor_factory=psycopg2.extras.DictCursor) as cur:
-                query = """
-                    SELECT 
-                        al.id,
-                        a.username as admin_username,
-                        al.admin_role,
-                        al.action_type,
-                        al.entity_type,
-                        al.entity_id,
-                        al.details,
-                        al.created_at
-                    FROM audit_logs al
-                    JOIN admins a ON al.admin_id = a.id
-                """
-                
-                where_clauses = []
-                params = []
-                
-                if filters:
-                    if filters.get('admin_id'):
-                        where_clauses.append("al.admin_id = %s")
-                        params.append(filters['admin_id'])
-                    if filters.get('action_type') and filters['action_type'] != "All":
-                        where_clauses.append("al.action_type = %s")
-                        params.append(filters['action_type'])
-                    if filters.get('date_from'):
-                        where_clauses.append("al.created_at >= %s")
-                        params.append(filters['date_from'])
-                    if filters.get('date_to'):
-                        where_clauses.append("al.created_at <= %s")
-                        params.append(filters['date_to'])
-                
-                if where_clauses:
-                    query += " WHERE " + " AND ".join(where_clauses)
-                
-                query += " ORDER BY al.created_at DESC"
-                
-                print(f"Executing query: {query} with params: {params}")
+        with get_conn() as conn:
+            with conn.cursor(name="audit_stream", cursor_factory=DictCursor) as cur:
+                cur.itersize = AUDIT_FETCH_ITERSIZE
+                logger.debug("Executing query: %s with params: %s", query, params)
                 cur.execute(query, params)
-                results = cur.fetchall()
-                print(f"Found {len(results)} audit logs")
-                return results
+                yield from cur
     except Exception as e:
-        print(f"Error retrieving audit logs: {str(e)}")
-        import traceback
-        print(traceback.format_exc())
-        return []
+        logger.exception("Error retrieving audit logs: %s", e)
 
 def get_audit_summary():
     """
@@ -204,37 +211,46 @@ def get_audit_summary():
         Dict containing summary statistics
     """
     try:
-        with get_db_connection() as conn:
+        with get_conn() as conn:
             with conn.cursor() as cur:
-                # Get total actions by type
-                cur.execute("""
-                    SELECT action_type, COUNT(*) 
-                    FROM audit_logs 
-                    GROUP BY action_type
-                """)
-                action_counts = dict(cur.fetchall())
-                
-                # Get actions by role
-                cur.execute("""
-                    SELECT admin_role, COUNT(*) 
-                    FROM audit_logs 
-                    GROUP BY admin_role
-                """)
-                role_counts = dict(cur.fetchall())
-                
-                # Get recent activity count (last 24 hours)
+                # Count by action, by role and over the last 24 hours in one
+                # round trip; actions come first, most common first
                 cur.execute("""
-                    SELECT COUNT(*) 
-                    FROM audit_logs 
-                    WHERE created_at >= NOW() - INTERVAL '24 hours'
+                    SELECT kind, key, count FROM (
+                        SELECT 'action' AS kind, action_type AS key, COUNT(*) AS count
+                        FROM audit_logs
+                        GROUP BY action_type
+                        UNION ALL
+                        SELECT 'role', admin_role, COUNT(*)
+                        FROM audit_logs
+                        GROUP BY admin_role
+                        UNION ALL
+                        SELECT 'recent', NULL, COUNT(*)
+                        FROM audit_logs
+                        WHERE created_at >= NOW() - INTERVAL '24 hours'
+                    ) counts
+                    ORDER BY kind = 'action' DESC, count DESC
                 """)
-                recent_count = cur.fetchone()[0]
+                action_rows = []
+                role_counts = {}
+                recent_count = 0
+                for kind, key, count in cur.fetchall():
+                    if kind == 'action':
+                        action_rows.append((key, count))
+                    elif kind == 'role':
+                        role_counts[key] = count
+                    else:
+                        recent_count = count
+                action_counts = dict(action_rows)
+                most_common_action, most_common_count = action_rows[0] if action_rows else (None, 0)
                 
                 return {
                     'action_counts': action_counts,
+                    'most_common_action': most_common_action,
+                    'most_common_count': most_common_count,
                     'role_counts': role_counts,
                     'recent_count': recent_count
                 }
     except Exception as e:
-        print(f"Error getting audit summary: {str(e)}")
+        logger.exception("Error getting audit summary: %s", e)
         return {}
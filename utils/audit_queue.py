@@ -0,0 +1,258 @@
+import atexit
+import io
+import logging
+import queue
+import threading
+import time
+from psycopg2.extras import execute_batch, execute_values
+from models.database import get_conn, execute_prepared, copy_csv_row
+
+logger = logging.getLogger(__name__)
+
+# Entries waiting for the background writer; bounded so a stalled database
+# blocks callers briefly instead of growing memory without limit
+AUDIT_QUEUE_MAXSIZE = 10_000
+AUDIT_ENQUEUE_TIMEOUT = 5
+# The writer inserts up to AUDIT_BATCH_SIZE entries per round trip, waiting
+# at most AUDIT_FLUSH_INTERVAL seconds for a batch to fill
+AUDIT_BATCH_SIZE = 500
+AUDIT_FLUSH_INTERVAL = 0.25
+# Batches at least this large, which only the shutdown drain builds, are
+# streamed with COPY instead of a multi-row INSERT
+AUDIT_COPY_THRESHOLD = 1000
+# Admin ids resolved from usernames are reused for this many seconds
+ADMIN_ID_TTL = 300
+# Failed login counts are accumulated per username and written by the same
+# background thread at most this often, so a brute-force flood costs one
+# UPDATE per username per interval instead of one per attempt
+LOGIN_FAILURE_FLUSH_INTERVAL = 0.5
+# At shutdown the writer is given this long to finish the batch in hand
+AUDIT_SHUTDOWN_TIMEOUT = 10
+
+_audit_queue = queue.Queue(maxsize=AUDIT_QUEUE_MAXSIZE)
+_audit_writer = None
+_audit_writer_lock = threading.Lock()
+# Set at shutdown so the writer stops taking new batches off the queue
+_audit_stop = threading.Event()
+# username -> (admin id, monotonic expiry) for entries queued without an id
+_admin_ids = {}
+# username -> failed logins not yet added to admins.login_attempts
+_pending_login_failures = {}
+_pending_login_failures_lock = threading.Lock()
+# Held while pending counts are taken and written, so clear_login_failures
+# can wait out a flush that already took them
+_login_failures_flush_lock = threading.Lock()
+# Callbacks run after each batch is written, e.g. to drop cached audit reads
+_flush_listeners = []
+
+def on_audit_flush(callback):
+    """Register a no-argument callback to run after each batch of entries is written."""
+    _flush_listeners.append(callback)
+    return callback
+
+def forget_admin_id(username):
+    """Drop a cached admin id, e.g. after the account is created or deleted."""
+    _admin_ids.pop(username, None)
+
+def _resolve_admin_ids(cur, usernames):
+    """Map usernames to admin ids, querying only those not cached or expired."""
+    now = time.monotonic()
+    resolved = {}
+    missing = []
+    for username in usernames:
+        cached = _admin_ids.get(username)
+        if cached and cached[1] > now:
+            resolved[username] = cached[0]
+        else:
+            missing.append(username)
+    if missing:
+        execute_prepared(cur, "select_admin_ids", (missing,))
+        for username, admin_id in cur.fetchall():
+            _admin_ids[username] = (admin_id, now + ADMIN_ID_TTL)
+            resolved[username] = admin_id
+    return resolved
+
+def _flush_audit_batch(batch):
+    """Insert a batch of queued audit entries with a single INSERT.
+    
+    Entries normally carry the admin id stashed at login; any that don't
+    are resolved by username through the cached lookup.
+    """
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            usernames = {record['admin_username'] for record in batch if not record.get('admin_id')}
+            admin_ids = _resolve_admin_ids(cur, usernames) if usernames else {}
+            
+            rows = []
+            for record in batch:
+                admin_id = record.get('admin_id') or admin_ids.get(record['admin_username'])
+                if admin_id is None:
+                    logger.error("No admin found with username: %s", record['admin_username'])
+                    continue
+                rows.append((
+                    admin_id,
+                    record['admin_role'],
+                    record['action_type'],
+                    record['entity_type'],
+                    record['entity_id'],
+                    record['details'],
+                    record['created_at']
+                ))
+            
+            if len(rows) >= AUDIT_COPY_THRESHOLD:
+                _copy_audit_rows(cur, rows)
+            elif rows:
+                execute_values(cur, """
+                    INSERT INTO audit_logs
+                    (admin_id, admin_role, action_type, entity_type, entity_id, details, created_at)
+                    VALUES %s
+                """, rows, page_size=len(rows))
+
+def _copy_audit_rows(cur, rows):
+    """Load audit rows through COPY, encoding the Json details as text."""
+    buffer = io.StringIO()
+    for admin_id, admin_role, action_type, entity_type, entity_id, details, created_at in rows:
+        buffer.write(copy_csv_row((
+            admin_id, admin_role, action_type, entity_type, entity_id,
+            None if details is None else details.dumps(details.adapted),
+            created_at
+        )))
+    buffer.seek(0)
+    cur.copy_expert(
+        "COPY audit_logs (admin_id, admin_role, action_type, entity_type, entity_id, details, created_at) "
+        "FROM STDIN WITH (FORMAT csv)",
+        buffer
+    )
+
+def _write_batch(batch):
+    """Flush a batch, reporting rather than raising errors, and mark it done."""
+    try:
+        _flush_audit_batch(batch)
+        for callback in _flush_listeners:
+            callback()
+    except Exception as e:
+        logger.exception("Database error writing %d audit log entries: %s", len(batch), e)
+    finally:
+        for _ in batch:
+            _audit_queue.task_done()
+
+def _flush_login_failures():
+    """Add the accumulated failed login counts to admins in one batch."""
+    with _login_failures_flush_lock:
+        with _pending_login_failures_lock:
+            if not _pending_login_failures:
+                return
+            pending = dict(_pending_login_failures)
+            _pending_login_failures.clear()
+        try:
+            with get_conn() as conn:
+                with conn.cursor() as cur:
+                    execute_batch(cur, """
+                        UPDATE admins 
+                        SET login_attempts = COALESCE(login_attempts, 0) + %s,
+                            last_login_attempt = CURRENT_TIMESTAMP
+                        WHERE username = %s
+                    """, [(count, username) for username, count in pending.items()])
+        except Exception as e:
+            logger.exception("Database error recording failed logins for %d admins: %s", len(pending), e)
+
+def _audit_writer_loop():
+    """Drain the audit queue forever, flushing a batch every AUDIT_FLUSH_INTERVAL.
+    
+    Failed login counts are flushed at least every LOGIN_FAILURE_FLUSH_INTERVAL.
+    Stops once _audit_stop is set, after writing the batch it has taken.
+    """
+    while not _audit_stop.is_set():
+        try:
+            batch = [_audit_queue.get(timeout=LOGIN_FAILURE_FLUSH_INTERVAL)]
+        except queue.Empty:
+            batch = []
+        deadline = time.monotonic() + AUDIT_FLUSH_INTERVAL
+        while batch and len(batch) < AUDIT_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_audit_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        if batch:
+            _write_batch(batch)
+        _flush_login_failures()
+
+def _ensure_audit_writer():
+    """Start the background audit writer thread if it is not running yet."""
+    global _audit_writer
+    if _audit_stop.is_set() or (_audit_writer is not None and _audit_writer.is_alive()):
+        return
+    with _audit_writer_lock:
+        if not _audit_stop.is_set() and (_audit_writer is None or not _audit_writer.is_alive()):
+            _audit_writer = threading.Thread(
+                target=_audit_writer_loop,
+                name="audit-writer",
+                daemon=True
+            )
+            _audit_writer.start()
+
+def enqueue_audit_record(record):
+    """
+    Queue an audit entry for the background writer.
+    
+    Args:
+        record: Dict with admin_id (None if unknown), admin_username, admin_role,
+            action_type, entity_type, entity_id, details (a psycopg2 Json or None)
+            and created_at
+    
+    Returns:
+        True once queued, False if the queue stayed full for AUDIT_ENQUEUE_TIMEOUT
+    """
+    _ensure_audit_writer()
+    try:
+        _audit_queue.put(record, timeout=AUDIT_ENQUEUE_TIMEOUT)
+    except queue.Full:
+        logger.error("Audit log queue is full, dropping entry")
+        return False
+    return True
+
+def record_login_failure(username):
+    """Count a failed login for username, to be added to admins by the background thread."""
+    with _pending_login_failures_lock:
+        _pending_login_failures[username] = _pending_login_failures.get(username, 0) + 1
+    _ensure_audit_writer()
+
+def clear_login_failures(username):
+    """Drop failed logins for username not yet written.
+    
+    Call before resetting admins.login_attempts, e.g. on a successful login:
+    once this returns, any flush that already took the counts has committed,
+    so the reset is not undone by stale failures landing after it.
+    """
+    with _login_failures_flush_lock:
+        with _pending_login_failures_lock:
+            _pending_login_failures.pop(username, None)
+
+@atexit.register
+def drain_audit_queue():
+    """Write out entries still queued at shutdown, before the daemon writer is killed.
+    
+    The writer is stopped first and given AUDIT_SHUTDOWN_TIMEOUT seconds to
+    finish the batch it already took off the queue, so the drain is then the
+    only writer. Everything left is written as one batch, so a large backlog
+    goes through COPY.
+    """
+    _audit_stop.set()
+    writer = _audit_writer
+    if writer is not None and writer.is_alive():
+        writer.join(AUDIT_SHUTDOWN_TIMEOUT)
+        if writer.is_alive():
+            logger.warning("Audit writer still busy after %d seconds, draining alongside it",
+                           AUDIT_SHUTDOWN_TIMEOUT)
+    batch = []
+    while True:
+        try:
+            batch.append(_audit_queue.get_nowait())
+        except queue.Empty:
+            break
+    if batch:
+        _write_batch(batch)
+    _flush_login_failures()
@@ -1,13 +1,91 @@
 import streamlit as st
+import hashlib
+import hmac
+import logging
 import os
-from datetime import datetime, timedelta
+import threading
+import time
 from psycopg2.extras import DictCursor
-from models.database import get_db_connection
+from models.database import get_conn, execute_prepared
+from utils.audit_queue import forget_admin_id, record_login_failure, clear_login_failures
+
+logger = logging.getLogger(__name__)
+
+# scrypt cost parameters for new password hashes; they are stored with each
+# hash, so raising them later only affects passwords set afterwards
+SCRYPT_N = 2 ** 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SCRYPT_DKLEN = 32
+
+# Failed logins tolerated before an account is locked, and for how long
+LOGIN_ATTEMPT_LIMIT = 5
+LOCKOUT_SECONDS = 300
+# Failed logins seen by this process, as username -> (count, monotonic time of
+# the latest failure). Once a username reaches LOGIN_ATTEMPT_LIMIT, further
+# attempts are refused here without touching the database. Entries lapse
+# LOCKOUT_SECONDS after the latest failure; the table is capped so a flood of
+# made-up usernames cannot grow it without limit.
+FAILED_LOGIN_CACHE_SIZE = 10_000
+_failed_logins = {}
+_failed_logins_lock = threading.Lock()
+
+def _local_lockout_remaining(username):
+    """Seconds left on this process's lockout of username, or 0 if not locked."""
+    with _failed_logins_lock:
+        entry = _failed_logins.get(username)
+        if not entry:
+            return 0
+        count, last_failure = entry
+        remaining = LOCKOUT_SECONDS - (time.monotonic() - last_failure)
+        if remaining <= 0:
+            del _failed_logins[username]
+            return 0
+        return remaining if count >= LOGIN_ATTEMPT_LIMIT else 0
+
+def _record_failed_login(username):
+    """Count a failed login for username in this process."""
+    now = time.monotonic()
+    with _failed_logins_lock:
+        if username not in _failed_logins and len(_failed_logins) >= FAILED_LOGIN_CACHE_SIZE:
+            # Drop lapsed entries, then the oldest if still full
+            for key in [k for k, (_, t) in _failed_logins.items() if now - t >= LOCKOUT_SECONDS]:
+                del _failed_logins[key]
+            if len(_failed_logins) >= FAILED_LOGIN_CACHE_SIZE:
+                del _failed_logins[next(iter(_failed_logins))]
+        count, last_failure = _failed_logins.get(username, (0, now))
+        if now - last_failure >= LOCKOUT_SECONDS:
+            count = 0
+        _failed_logins[username] = (count + 1, now)
+
+def _format_lockout(remaining_seconds):
+    """Format a lockout as the 'locked:m:ss' result of check_credentials."""
+    minutes = int(remaining_seconds // 60)
+    seconds = int(remaining_seconds % 60)
+    return f'locked:{minutes}:{seconds:02d}'
 
 def hash_password(password):
-    """Simple password hashing."""
-    import hashlib
-    return hashlib.sha256(password.encode()).hexdigest()
+    """Hash a password with scrypt as 'scrypt$n$r$p$salt$hash'."""
+    salt = os.urandom(16)
+    digest = hashlib.scrypt(
+        password.encode(), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P, dklen=SCRYPT_DKLEN
+    )
+    return f"scrypt${SCRYPT_N}${SCRYPT_R}${SCRYPT_P}${salt.hex()}${digest.hex()}"
+
+def verify_password(password, stored_hash):
+    """Check a password against a stored scrypt hash or a legacy SHA-256 hex digest."""
+    if stored_hash.startswith("scrypt$"):
+        _, n, r, p, salt, digest = stored_hash.split("$")
+        candidate = hashlib.scrypt(
+            password.encode(), salt=bytes.fromhex(salt), n=int(n), r=int(r), p=int(p),
+            dklen=len(digest) // 2
+        )
+        return hmac.compare_digest(candidate.hex(), digest)
+    return hmac.compare_digest(hashlib.sha256(password.encode()).hexdigest(), stored_hash)
+
+def needs_rehash(stored_hash):
+    """True for legacy SHA-256 hashes, which are upgraded on the next login."""
+    return not stored_hash.startswith("scrypt$")
 
 def check_credentials(username, password):
     """
@@ -17,61 +95,56 @@ def check_credentials(username, password):
     if not username or not password:
         return None
     
-    with get_db_connection() as conn:
+    # Refuse repeated failures in-process so a flood never reaches the database
+    local_remaining = _local_lockout_remaining(username)
+    if local_remaining > 0:
+        return _format_lockout(local_remaining)
+    
+    with get_conn() as conn:
         with conn.cursor(cursor_factory=DictCursor) as cur:
             # Check if account exists and get status
-            cur.execute(
-                """
-                SELECT role, password_hash, login_attempts, last_login_attempt, is_active
-                FROM admins WHERE username = %s
-                """,
-                (username,)
-            )
+            execute_prepared(cur, "select_admin_login", (username, LOCKOUT_SECONDS))
             result = cur.fetchone()
             
             if not result:
+                _record_failed_login(username)
                 return None
             
             # Check if account is active
             if not result.get('is_active', True):
                 return 'inactive'
                 
-            # Check for account lockout
-            if result.get('login_attempts', 0) >= 5:
-                # Check if enough time has passed to unlock
-                if result.get('last_login_attempt'):
-                    lockout_duration = datetime.now() - result['last_login_attempt']
-                    remaining_seconds = max(300 - lockout_duration.total_seconds(), 0)  # 5 minutes lockout
-                    if remaining_seconds > 0:
-                        minutes = int(remaining_seconds // 60)
-                        seconds = int(remaining_seconds % 60)
-                        return f'locked:{minutes}:{seconds:02d}'
+            # Check for account lockout; the database works out how long is
+            # left from the latest failed attempt, using its own clock
+            remaining_seconds = result['lockout_remaining'] or 0
+            if (result['login_attempts'] or 0) >= LOGIN_ATTEMPT_LIMIT and remaining_seconds > 0:
+                return _format_lockout(remaining_seconds)
                 
-            if hash_password(password) == result['password_hash']:
-                # Reset login attempts on successful login
-                cur.execute(
-                    """
-                    UPDATE admins 
-                    SET login_attempts = 0,
-                        last_login = CURRENT_TIMESTAMP
-                    WHERE username = %s
-                    """,
-                    (username,)
-                )
+            if verify_password(password, result['password_hash']):
+                # Reset login attempts and upgrade a legacy hash, now that the
+                # plain password is known, in one statement. Matching on the
+                # verified hash means a password changed in the meantime
+                # fails the login instead of being overwritten.
+                new_hash = hash_password(password) if needs_rehash(result['password_hash']) else None
+                # Unwritten failed logins are dropped before the reset, not after,
+                # so a flush already under way can't re-add them once it commits
+                clear_login_failures(username)
+                execute_prepared(cur, "complete_login", (username, result['password_hash'], new_hash))
+                login = cur.fetchone()
+                if login is None:
+                    return None
                 conn.commit()
-                return result['role']
+                with _failed_logins_lock:
+                    _failed_logins.pop(username, None)
+                # Audit entries for this session carry the id, so logging
+                # an action never has to look the admin up again
+                st.session_state["admin_id"] = login['id']
+                return login['role']
             else:
-                # Increment login attempts
-                cur.execute(
-                    """
-                    UPDATE admins 
-                    SET login_attempts = COALESCE(login_attempts, 0) + 1,
-                        last_login_attempt = CURRENT_TIMESTAMP
-                    WHERE username = %s
-                    """,
-                    (username,)
-                )
-                conn.commit()
+                _record_failed_login(username)
+                # Increment login attempts; the background writer adds the
+                # counts accumulated for each username in one batch
+                record_login_failure(username)
                 return None
 
 def check_password():
@@ -100,18 +173,17 @@ def check_password():
                 st.error("❌ Invalid username or password. Please try again.")
                 return
             elif role:
-                print(f"Login successful for user {st.session_state['username']} with role {role}")
+                logger.debug("Login successful for user %s with role %s", st.session_state['username'], role)
                 st.session_state["admin_role"] = role
                 st.session_state["username_display"] = st.session_state["username"]
                 st.session_state["admin_username"] = st.session_state["username"]  # Add explicit admin username
                 st.session_state["login_failed"] = False
                 del st.session_state["username"]
                 del st.session_state["password"]
-                print(f"Updated session state: {st.session_state}")
             else:
                 st.session_state["admin_role"] = None
                 st.session_state["login_failed"] = True
-                print("Login failed - credentials did not match")
+                logger.debug("Login failed - credentials did not match")
 
     # Return True if already authenticated
     if st.session_state["admin_role"]:
@@ -133,47 +205,52 @@ def check_password():
 
 def ensure_super_admin_exists():
     """Ensure that at least one super admin exists in the system."""
-    with get_db_connection() as conn:
+    # Create default super admin if ADMIN_PASSWORD is set
+    admin_password = os.environ.get("ADMIN_PASSWORD")
+    if not admin_password:
+        return
+    
+    with get_conn() as conn:
         with conn.cursor() as cur:
-            # Check if super admin exists
-            cur.execute("SELECT COUNT(*) FROM admins WHERE role = 'super_admin'")
-            if cur.fetchone()[0] == 0:
-                # Create default super admin if ADMIN_PASSWORD is set
-                admin_password = os.environ.get("ADMIN_PASSWORD")
-                if admin_password:
-                    cur.execute(
-                        """
-                        INSERT INTO admins (
-                            username, password_hash, role, is_active, 
-                            login_attempts, last_login, created_at, updated_at
-                        ) VALUES (%s, %s, %s, true, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)
-                        """,
-                        ("superadmin", hash_password(admin_password), "super_admin")
-                    )
-                    conn.commit()
-                    print("Created default super admin account")
+            # Insert only when no super admin exists, in one statement
+            cur.execute(
+                """
+                INSERT INTO admins (
+                    username, password_hash, role, is_active, 
+                    login_attempts, last_login, created_at, updated_at
+                )
+                SELECT %s, %s, %s, true, 0, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP
+                WHERE NOT EXISTS (SELECT 1 FROM admins WHERE role = 'super_admin')
+                ON CONFLICT (username) DO NOTHING
+                RETURNING id
+                """,
+                ("superadmin", hash_password(admin_password), "super_admin")
+            )
+            if cur.fetchone():
+                conn.commit()
+                logger.info("Created default super admin account")
 
 def create_admin(username, password, role='admin'):
     """Create a new admin account."""
     if not is_super_admin():
         raise ValueError("Only super admin can create new admins")
     
-    with get_db_connection() as conn:
+    with get_conn() as conn:
         with conn.cursor() as cur:
-            # Check if username already exists
-            cur.execute("SELECT COUNT(*) FROM admins WHERE username = %s", (username,))
-            if cur.fetchone()[0] > 0:
-                raise ValueError(f"Username '{username}' already exists")
-            
-            # Create new admin
+            # The username's unique constraint rejects duplicates in the same statement
             cur.execute(
                 """
                 INSERT INTO admins (username, password_hash, role) 
                 VALUES (%s, %s, %s)
+                ON CONFLICT (username) DO NOTHING
+                RETURNING id
                 """,
                 (username, hash_password(password), role)
             )
+            if cur.fetchone() is None:
+                raise ValueError(f"Username '{username}' already exists")
             conn.commit()
+    forget_admin_id(username)
 
 def update_admin_password(username, new_password):
     """Update admin password."""
@@ -181,7 +258,9 @@ def update_admin_password(username, new_password):
     if not is_super_admin() and current_user != username:
         raise ValueError("Only super admin can change other admin passwords")
     
-    with get_db_connection() as conn:
+    # Drop unwritten failed logins first so they can't land after the reset
+    clear_login_failures(username)
+    with get_conn() as conn:
         with conn.cursor() as cur:
             cur.execute(
                 """
@@ -195,6 +274,9 @@ def update_admin_password(username, new_password):
             if cur.rowcount == 0:
                 raise ValueError(f"Admin '{username}' not found")
             conn.commit()
+    # The reset also lifts this process's lockout of the account
+    with _failed_logins_lock:
+        _failed_logins.pop(username, None)
 
 def delete_admin(username):
     """Delete an admin account."""
@@ -204,7 +286,7 @@ def delete_admin(username):
     if username == get_current_username():
         raise ValueError("Cannot delete your own account")
     
-    with get_db_connection() as conn:
+    with get_conn() as conn:
         with conn.cursor() as cur:
             # Check if it's the last super admin
             if username == 'superadmin':
@@ -216,6 +298,7 @@ def delete_admin(username):
             if cur.rowcount == 0:
                 raise ValueError(f"Admin '{username}' not found")
             conn.commit()
+    forget_admin_id(username)
 
 def check_permission(required_role='admin'):
     """Check if current user has required role permission."""
@@ -242,7 +325,7 @@ def get_all_admins():
     if not is_super_admin():
         raise ValueError("Only super admin can view all admins")
     
-    with get_db_connection() as conn:
+    with get_conn() as conn:
         with conn.cursor(cursor_factory=DictCursor) as cur:
             cur.execute(
                 """
@@ -268,3 +351,4 @@ def logout():
         del st.session_state["admin_role"]
     if "username_display" in st.session_state:
         del st.session_state["username_display"]
+    st.session_state.pop("admin_id", None)
@@ -0,0 +1,101 @@
+import streamlit as st
+from models.entities import EntityManager
+from utils.audit import get_audit_logs, get_audit_summary
+from utils.audit_queue import on_audit_flush
+
+# Streamlit reruns the whole script on every widget interaction, so reads that
+# back the admin tabs are cached briefly and cleared whenever data is changed.
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_cached_entities(entity_type=None, search_term=None, search_type="Name", tags=None,
+                        date_filter=None, date_to=None, relationship_types=None, min_connections=0):
+    """Cached EntityManager.get_entities keyed by the filter values.
+    
+    List filters should be passed as tuples so equal filters share an entry.
+    """
+    entities = EntityManager.get_entities(
+        entity_type=entity_type,
+        search_term=search_term,
+        search_type=search_type,
+        tags=list(tags) if tags else None,
+        date_filter=date_filter,
+        date_to=date_to,
+        relationship_types=list(relationship_types) if relationship_types else None,
+        min_connections=min_connections
+    )
+    return list(entities)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_cached_relationships(entity_type=None, search_term=None, search_type="Name", tags=None,
+                             date_filter=None, date_to=None, relationship_types=None, min_connections=0):
+    """Cached EntityManager.get_relationships for the catalog graph."""
+    relationships = EntityManager.get_relationships(
+        entity_type=entity_type,
+        search_term=search_term,
+        search_type=search_type,
+        tags=list(tags) if tags else None,
+        date_filter=date_filter,
+        date_to=date_to,
+        relationship_types=list(relationship_types) if relationship_types else None,
+        min_connections=min_connections
+    )
+    return list(relationships)
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_cached_entity_bundle(entity_id):
+    """Cached EntityManager.get_entity_bundle for the entity details panel."""
+    bundle = EntityManager.get_entity_bundle(entity_id)
+    return dict(bundle) if bundle else None
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_cached_tags():
+    """Cached EntityManager.get_tags for the tag filters."""
+    return EntityManager.get_tags()
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_cached_relationships_for_entities(entity_ids):
+    """Cached EntityManager.get_relationships_for_entities."""
+    relationships = EntityManager.get_relationships_for_entities(entity_ids)
+    return {entity_id: [dict(rel) for rel in rels] for entity_id, rels in relationships.items()}
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_cached_tags_for_entities(entity_ids):
+    """Cached EntityManager.get_tags_for_entities."""
+    tags = EntityManager.get_tags_for_entities(entity_ids)
+    return {entity_id: [dict(tag) for tag in entity_tags] for entity_id, entity_tags in tags.items()}
+
+@st.cache_data(ttl=30, show_spinner=False)
+def get_cached_audit_logs(filters=None):
+    """Cached get_audit_logs keyed by the filter values."""
+    return [dict(log) for log in get_audit_logs(filters)]
+
+@st.cache_data(ttl=10, show_spinner=False)
+def get_cached_recent_audit_logs(limit=5):
+    """Cached most recent audit log entries for the dashboard activity feed."""
+    return [dict(log) for log in get_audit_logs(limit=limit)]
+
+@st.cache_data(ttl=60, show_spinner=False)
+def get_cached_audit_summary():
+    """Cached get_audit_summary for the dashboard metrics."""
+    return get_audit_summary()
+
+@on_audit_flush
+def clear_cached_audit_reads():
+    """Drop cached audit reads once queued log entries have been written.
+    
+    Entries are written in the background after the action that logged them
+    has already cleared the caches, so the audit views are refreshed again here.
+    """
+    get_cached_audit_logs.clear()
+    get_cached_recent_audit_logs.clear()
+    get_cached_audit_summary.clear()
+
+def clear_cached_reads():
+    """Drop all cached reads after a change to entities, relationships, tags or logs."""
+    get_cached_entities.clear()
+    get_cached_relationships.clear()
+    get_cached_entity_bundle.clear()
+    get_cached_tags.clear()
+    get_cached_relationships_for_entities.clear()
+    get_cached_tags_for_entities.clear()
+    clear_cached_audit_reads()